@@ -5,16 +5,43 @@ import os
 import io
 import re
 import pickle
-import traceback
+import functools
+import contextlib
+import hashlib
+import heapq
+import threading
+import logging
 from datetime import datetime
+from typing import NamedTuple
+from urllib.parse import quote, quote_plus
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Document processing
-from PyPDF2 import PdfReader
+from pypdf import PdfReader
 import docx
 
+# PyMuPDF (MuPDF C extractor) jauh lebih cepat dari pypdf; pypdf tetap jadi fallback
+try:
+    import fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
 # AI & ML
 import faiss
-from sentence_transformers import SentenceTransformer
+from utils.embeddings import load_embedding_model, encode_query
+
+# ========================================
+# LOGGING
+# ========================================
+# Silent by default; set DTP_LOG_LEVEL (e.g. "INFO", "DEBUG") to emit to stderr.
+# Guarded because Streamlit re-executes this script on every rerun.
+logger = logging.getLogger("dtpmxy")
+if not logger.handlers:
+    logger.addHandler(logging.NullHandler())
+    if _log_level := os.environ.get("DTP_LOG_LEVEL"):
+        logging.basicConfig(level=_log_level.upper())
 
 # ========================================
 # IMPORT CONFIGURATION
@@ -22,7 +49,8 @@ from sentence_transformers import SentenceTransformer
 try:
     from config import (
         EXCEL_PATH, SHEET_PON, SHEET_TALENTA, SHEET_COURSE,
-        GOOGLE_CSE_ID, GEMINI_API_KEY, GEMINI_BASE_URL, GEMINI_MODEL,
+        GOOGLE_CSE_ID, GEMINI_BASE_URL, GEMINI_MODEL,
+        SEMANTIC_MODEL, CACHE_TTL_COURSES, CACHE_TTL_SKKNI,
         validate_config, get_api_status
     )
     CONFIG_LOADED = True
@@ -67,7 +95,10 @@ st.set_page_config(
 # ========================================
 # CSS STYLING
 # ========================================
-st.markdown("""
+# Satu stylesheet untuk seluruh app. Tetap di-emit setiap rerun: Streamlit
+# menghapus elemen yang tidak dirender ulang, jadi guard "sekali per session"
+# justru akan menghilangkan style setelah rerun pertama.
+APP_CSS = """
 <style>
 /* Global Dark Theme */
 body, .stApp {
@@ -90,6 +121,12 @@ body, .stApp {
     transform: translateY(-2px);
 }
 
+.job-portal-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+    gap: 14px;
+}
+
 /* Okupasi Card */
 .okupasi-card {
     background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -110,8 +147,27 @@ body, .stApp {
     background-color: #1c1f2b !important;
     border: 1px solid #2e3244 !important;
 }
+
+/* Course Cards */
+.course-card-header {
+    font-size: 1.1rem;
+    font-weight: 600;
+    margin-bottom: 0.5rem;
+}
+.course-card-meta {
+    font-size: 0.9rem;
+    color: #ddd;
+}
+.keyword-badge {
+    background-color: rgba(57, 255, 20, 0.1);
+    padding: 2px 6px;
+    border-radius: 4px;
+    font-size: 0.8em;
+    color: #39ff14;
+}
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # ========================================
 # VALIDATION AT STARTUP
@@ -142,6 +198,7 @@ def init_session_state():
         'okupasi_info': {},
         'skill_gap': "",
         'profil_teks': "",
+        'profil_hash': "",
         'learning_path': [],
         'recommendations': []
     }
@@ -160,28 +217,34 @@ init_session_state()
 # HELPER FUNCTIONS
 # ========================================
 
+_CTRL_RE = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+_WS_RE = re.compile(r"\s+")
+_SKILL_SPLIT_RE = re.compile(r"[,;/\\|•\n\t]+")
+
+# Common stopwords to exclude from skill tokens
+SKILL_STOPWORDS = frozenset({
+    'in', 'at', 'on', 'of', 'and', 'or', 'the', 'a', 'an', 'to', 'for', 'with', 'by', 
+    'from', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'has', 'have', 'had',
+    'dan', 'di', 'ke', 'dari', 'yang', 'ini', 'itu', 'pada', 'untuk', 'dengan'
+})
+
 def normalize_text(text: str) -> str:
     """Normalize text by removing special characters and extra whitespace"""
     if not isinstance(text, str):
         return ""
     text = text.replace('\xa0', ' ')
-    text = re.sub(r"[\x00-\x1f\x7f-\x9f]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _CTRL_RE.sub("", text)
+    text = _WS_RE.sub(" ", text).strip()
     return text
 
-def extract_skill_tokens(text: str) -> list:
-    """Extract skill tokens from text"""
+@functools.lru_cache(maxsize=256)
+def extract_skill_tokens(text: str) -> tuple:
+    """Extract skill tokens from text (memoized; returns an immutable tuple)"""
     text = normalize_text(text).lower()
     
     # Split by delimiters including bullet points and newlines
-    parts = re.split(r"[,;/\\|•\n\t]+", text)
-    
-    # Common stopwords to exclude
-    stopwords = {
-        'in', 'at', 'on', 'of', 'and', 'or', 'the', 'a', 'an', 'to', 'for', 'with', 'by', 
-        'from', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'has', 'have', 'had',
-        'dan', 'di', 'ke', 'dari', 'yang', 'ini', 'itu', 'pada', 'untuk', 'dengan'
-    }
+    parts = _SKILL_SPLIT_RE.split(text)
+    stopwords = SKILL_STOPWORDS
     
     tokens = []
     for p in parts:
@@ -204,7 +267,7 @@ def extract_skill_tokens(text: str) -> list:
             
         tokens.append(clean_p)
         
-    return list(dict.fromkeys(tokens))
+    return tuple(dict.fromkeys(tokens))
 
 
 
@@ -221,24 +284,65 @@ def display_skill_gap_chart_fallback(gap_analysis):
 # CV PROCESSING FUNCTIONS
 # ========================================
 
-def extract_text_from_pdf(file_io) -> str:
-    """Extract text from PDF file"""
+# Regex CV parser dikompilasi sekali saat import
+_EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+_LINKEDIN_RE = re.compile(r'linkedin\.com/in/([\w-]+)', re.IGNORECASE)
+
+# Daftar kota untuk deteksi lokasi; alias dipetakan ke nama resmi
+CV_CITIES = (
+    "Jakarta", "Bandung", "Surabaya", "Yogyakarta", "Medan",
+    "Semarang", "Makassar", "Denpasar", "Palembang"
+)
+CV_CITY_ALIASES = {"jogja": "Yogyakarta"}
+
+# Satu alternation literal (longest-first) dengan word boundary: satu kali scan,
+# tanpa backtracking berarti meskipun daftar kota bertambah
+_CITY_RE = re.compile(
+    r'\b(' + '|'.join(
+        re.escape(c) for c in sorted((*CV_CITIES, *CV_CITY_ALIASES), key=len, reverse=True)
+    ) + r')\b',
+    re.IGNORECASE
+)
+
+# CV jarang lebih dari 10 halaman; batasi agar PDF panjang tidak memblokir upload
+MAX_PDF_PAGES = 10
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def extract_text_from_pdf(file_bytes: bytes) -> str:
+    """Extract text from PDF file (cached per uploaded bytes, first MAX_PDF_PAGES pages)"""
     try:
-        reader = PdfReader(file_io)
-        return "".join([page.extract_text() or "" for page in reader.pages])
+        parts = []
+        if PYMUPDF_AVAILABLE:
+            with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+                for i, page in enumerate(doc):
+                    if i >= MAX_PDF_PAGES:
+                        break
+                    if text := page.get_text("text"):
+                        parts.append(text)
+        else:
+            reader = PdfReader(io.BytesIO(file_bytes))
+            for i, page in enumerate(reader.pages):
+                if i >= MAX_PDF_PAGES:
+                    break
+                # Halaman hasil scan (image-only) mengembalikan teks kosong
+                if text := page.extract_text():
+                    parts.append(text)
+        return "\n".join(parts)
     except Exception as e:
         st.error(f"Error reading PDF: {e}")
         return ""
 
-def extract_text_from_docx(file_io) -> str:
-    """Extract text from DOCX file"""
+@st.cache_data(show_spinner=False, max_entries=16)
+def extract_text_from_docx(file_bytes: bytes) -> str:
+    """Extract text from DOCX file (cached per uploaded bytes)"""
     try:
-        doc = docx.Document(file_io)
+        doc = docx.Document(io.BytesIO(file_bytes))
         return "\n".join([p.text for p in doc.paragraphs if p.text])
     except Exception as e:
         st.error(f"Error reading DOCX: {e}")
         return ""
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def parse_cv_data(cv_text: str) -> dict:
     """Parse CV data using regex patterns"""
     data = {
@@ -250,30 +354,24 @@ def parse_cv_data(cv_text: str) -> dict:
     }
     
     # Extract email
-    if match := re.search(r'[\w\.-]+@[\w\.-]+\.\w+', cv_text):
+    if match := _EMAIL_RE.search(cv_text):
         data["email"] = match.group(0)
     
     # Extract LinkedIn
-    if match := re.search(r'linkedin\.com/in/([\w-]+)', cv_text, re.IGNORECASE):
+    if match := _LINKEDIN_RE.search(cv_text):
         data["linkedin"] = f"https://www.linkedin.com/in/{match.group(1)}"
     
-    # Extract name (first line heuristic)
-    lines = cv_text.split('\n')
-    for line in lines[:5]:
+    # Extract name (first line heuristic); maxsplit -> hanya 5 baris awal yang dialokasikan
+    for line in cv_text.split('\n', 5)[:5]:
         line = line.strip()
         if line and '@' not in line and len(line.split()) <= 4 and len(line) > 5:
             data["nama"] = line.title()
             break
     
     # Extract location
-    if match := re.search(
-        r'(Jakarta|Bandung|Surabaya|Yogyakarta|Jogja|Medan|Semarang|Makassar|Denpasar|Palembang)',
-        cv_text, re.IGNORECASE
-    ):
-        lokasi = match.group(0).title()
-        if lokasi == "Jogja":
-            lokasi = "Yogyakarta"
-        data["lokasi"] = lokasi
+    if match := _CITY_RE.search(cv_text):
+        found = match.group(0)
+        data["lokasi"] = CV_CITY_ALIASES.get(found.lower(), found.title())
     
     return data
 
@@ -281,80 +379,167 @@ def parse_cv_data(cv_text: str) -> dict:
 # SEMANTIC SEARCH FUNCTIONS
 # ========================================
 
+# Di bawah jumlah baris ini brute-force IndexFlatIP lebih cepat (dan exact) dibanding HNSW
+HNSW_MIN_ROWS = 5000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 32
+# Penyimpanan vektor korpus kecil (cabang flat): "flat" = FP32 exact,
+# "fp16" = scalar quantizer fp16 (2x lebih kecil, tanpa training)
+FLAT_INDEX_KIND = "fp16"
+ENCODE_BATCH_SIZE = 128  # batch besar -> GEMM lebih lebar saat build index
+ENCODE_FP16 = True  # autocast FP16 saat encode korpus, hanya jika model di GPU
+
+def _encode_precision(model):
+    """Autocast FP16 untuk encode korpus di CUDA; di CPU FP16 tidak lebih cepat, tetap FP32"""
+    if ENCODE_FP16 and model.device.type == "cuda":
+        import torch
+        return torch.autocast("cuda", dtype=torch.float16)
+    return contextlib.nullcontext()
+
+def _build_faiss_index(vectors: np.ndarray):
+    """Build inner-product index: flat untuk korpus kecil, HNSW untuk korpus besar"""
+    d = vectors.shape[1]
+    if len(vectors) < HNSW_MIN_ROWS:
+        if FLAT_INDEX_KIND == "fp16":
+            index = faiss.IndexScalarQuantizer(
+                d, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            index = faiss.IndexFlatIP(d)
+    else:
+        index = faiss.IndexHNSWFlat(d, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    index.add(vectors)
+    return index
+
+def _read_faiss_index(path: str):
+    """Load index via mmap (read-only), fallback ke read biasa jika tidak didukung"""
+    try:
+        index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except Exception:
+        index = faiss.read_index(path)
+    if hasattr(index, 'hnsw'):
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    return index
+
+# Kolom PON yang dipakai saat mapping (hanya ini yang disimpan di cache parquet)
+PON_INDEX_COLUMNS = ["OkupasiID", "Okupasi", "Unit_Kompetensi", "Kuk_Keywords"]
+
+def _pon_records(df_pon: pd.DataFrame) -> list:
+    """Record per baris PON, dibuat sekali saat index dimuat.
+
+    Hasil top-k cukup ambil records[idx] (tanpa df_pon.iloc per query);
+    Kuk_Keywords sudah ditokenisasi jadi frozenset untuk hitung skill gap.
+    """
+    return [
+        {
+            "id": okupasi_id,
+            "nama": okupasi,
+            "kuk": frozenset(t for t in str(kw).lower().split() if len(t) > 2),
+        }
+        for okupasi_id, okupasi, kw in df_pon[['OkupasiID', 'Okupasi', 'Kuk_Keywords']].itertuples(
+            index=False, name=None
+        )
+    ]
+
 @st.cache_resource
 def initialize_semantic_search(excel_path: str, sheet_name: str):
     """Initialize AI Semantic Search Engine with FAISS"""
     INDEX_FILE = "data/pon_index.faiss"
-    DATA_FILE = "data/pon_data.pkl"
-    MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+    DATA_FILE = "data/pon_data.parquet"
+    LEGACY_DATA_FILE = "data/pon_data.pkl"
     
     try:
-        model = SentenceTransformer(MODEL_NAME)
+        model = load_embedding_model()
     except Exception as e:
         st.error(f"Gagal load model Sentence Transformer: {e}")
-        return None, None, None
+        return None, None, None, None
+    
+    # Migrasi cache lama (pickle) ke parquet
+    if os.path.exists(INDEX_FILE) and not os.path.exists(DATA_FILE) and os.path.exists(LEGACY_DATA_FILE):
+        try:
+            with open(LEGACY_DATA_FILE, 'rb') as f:
+                pickle.load(f)[PON_INDEX_COLUMNS].to_parquet(DATA_FILE, engine="pyarrow", compression="zstd")
+        except Exception as e:
+            st.warning(f"Gagal migrasi cache lama: {e}")
     
     # Load existing index
     if os.path.exists(INDEX_FILE) and os.path.exists(DATA_FILE):
         try:
-            index = faiss.read_index(INDEX_FILE)
-            with open(DATA_FILE, 'rb') as f:
-                df_pon = pickle.load(f)
-            return model, index, df_pon
+            index = _read_faiss_index(INDEX_FILE)
+            df_pon = pd.read_parquet(DATA_FILE, engine="pyarrow")
+            return model, index, df_pon, _pon_records(df_pon)
         except Exception as e:
             st.warning(f"Gagal memuat cache: {e}. Membangun ulang...")
     
     # Build new index
     with st.spinner("Membangun semantic search index..."):
         try:
-            df_pon = pd.read_excel(excel_path, sheet_name=sheet_name, engine='openpyxl')
+            df_pon = pd.read_excel(
+                excel_path, sheet_name=sheet_name, engine='openpyxl',
+                usecols=PON_INDEX_COLUMNS
+            )
             
             if df_pon is None or df_pon.empty:
                 st.error(f"Data PON di sheet '{sheet_name}' kosong.")
-                return None, None, None
+                return None, None, None, None
             
             # Create corpus
-            pon_corpus = (
-                "Okupasi: " + df_pon['Okupasi'].astype(str) + ". " +
-                "Unit Kompetensi: " + df_pon['Unit_Kompetensi'].astype(str) + ". " +
-                "Keterampilan: " + df_pon['Kuk_Keywords'].astype(str)
-            )
+            pon_corpus = [
+                f"Okupasi: {o}. Unit Kompetensi: {u}. Keterampilan: {k}"
+                for o, u, k in df_pon[['Okupasi', 'Unit_Kompetensi', 'Kuk_Keywords']].astype(str).itertuples(
+                    index=False, name=None
+                )
+            ]
             
-            # Encode
-            pon_vectors = model.encode(pon_corpus.tolist(), show_progress_bar=True)
+            # Encode (sudah L2-normalized; hasil FP16 dikembalikan ke float32 untuk FAISS)
+            with _encode_precision(model):
+                pon_vectors = model.encode(
+                    pon_corpus, batch_size=ENCODE_BATCH_SIZE, show_progress_bar=True,
+                    convert_to_numpy=True, normalize_embeddings=True
+                )
+            pon_vectors = pon_vectors.astype(np.float32, copy=False)
             
             # Create FAISS index
-            d = pon_vectors.shape[1]
-            index = faiss.IndexFlatIP(d)
-            faiss.normalize_L2(pon_vectors)
-            index.add(pon_vectors)
+            index = _build_faiss_index(pon_vectors)
             
             # Save
             os.makedirs("data", exist_ok=True)
             faiss.write_index(index, INDEX_FILE)
-            with open(DATA_FILE, 'wb') as f:
-                pickle.dump(df_pon, f)
+            df_pon.to_parquet(DATA_FILE, engine="pyarrow", compression="zstd")
             
-            return model, index, df_pon
+            return model, index, df_pon, _pon_records(df_pon)
         except Exception as e:
             st.error(f"Error saat membangun semantic index: {e}")
-            traceback.print_exc()
-            return None, None, None
+            logger.exception("semantic index build failed")
+            return None, None, None, None
+
+_search_scratch = threading.local()
+
+def _get_search_buffers(k: int):
+    """Preallocated FAISS output buffers, per thread (Streamlit sessions run concurrently)"""
+    bufs = getattr(_search_scratch, 'bufs', None)
+    if bufs is None or bufs[0].shape[1] != k:
+        bufs = (np.empty((1, k), dtype=np.float32), np.empty((1, k), dtype=np.int64))
+        _search_scratch.bufs = bufs
+    return bufs
 
 def map_profile_semantically(profile_text: str, k: int = 3) -> list:
     """Map profile to SKKNI using semantic search, returning top k results"""
-    model, index, df_pon = initialize_semantic_search(EXCEL_PATH, SHEET_PON)
+    model, index, df_pon, pon_records = initialize_semantic_search(EXCEL_PATH, SHEET_PON)
     
     if model is None or index is None:
         return []
     
     try:
         # Encode query
-        query_vector = model.encode([profile_text])
-        faiss.normalize_L2(query_vector)
+        query_vector = encode_query(profile_text)
         
-        # Search
-        scores, indices = index.search(query_vector, k=k)
+        # Search (hasil ditulis ke buffer D/I yang dipakai ulang)
+        D, I = _get_search_buffers(k)
+        scores, indices = index.search(query_vector, k, D=D, I=I)
         
         results = []
         user_keywords = set(extract_skill_tokens(profile_text))
@@ -366,19 +551,16 @@ def map_profile_semantically(profile_text: str, k: int = 3) -> list:
             idx = indices[0][i]
             score = scores[0][i]
             
-            data = df_pon.iloc[idx]
+            data = pon_records[idx]
             
             # Calculate skill gap
-            required_keywords_raw = str(data.get('Kuk_Keywords', '')).lower().split()
-            required_keywords = set(k for k in required_keywords_raw if k and len(k) > 2)
-            
-            missing_skills = [s.title() for s in required_keywords if s not in user_keywords]
+            missing_skills = [s.title() for s in data["kuk"] - user_keywords]
             
-            skill_gap_text = ", ".join(sorted(missing_skills)[:5]) if missing_skills else "Tidak ada gap signifikan"
+            skill_gap_text = ", ".join(heapq.nsmallest(5, missing_skills)) if missing_skills else "Tidak ada gap signifikan"
             
             results.append({
-                "id": data.get('OkupasiID', 'N/A'),
-                "nama": data.get('Okupasi', 'N/A'),
+                "id": data["id"],
+                "nama": data["nama"],
                 "score": float(score),
                 "gap": skill_gap_text
             })
@@ -387,16 +569,15 @@ def map_profile_semantically(profile_text: str, k: int = 3) -> list:
     
     except Exception as e:
         st.error(f"Error saat mapping profil: {e}")
-        traceback.print_exc()
+        logger.exception("semantic profile mapping failed")
         return []
 
 # ========================================
 # MATCHER INITIALIZATION
 # ========================================
 
-@st.cache_resource
 def init_matcher():
-    """Initialize SKKNI matcher"""
+    """Initialize SKKNI matcher (cache ada di create_skkni_matcher, key termasuk mtime Excel)"""
     if not UTILS_LOADED:
         return None
         
@@ -406,6 +587,48 @@ def init_matcher():
         st.error(f"Error menginisialisasi matcher: {e}")
         return None
 
+# Wrapper cache_data di bawah hanya menerima argumen primitif (hashable murah);
+# matcher sendiri diambil dari init_matcher() (cache_resource), bukan di-hash.
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SKKNI)
+def get_job_search_keywords_cached(okupasi_id: str) -> list:
+    """Job search keywords per okupasi (memoized; matcher resolved via cache_resource)"""
+    matcher = init_matcher()
+    return matcher.get_job_search_keywords(okupasi_id) if matcher else []
+
+def hash_profile_text(profil_teks: str) -> str:
+    """Digest pendek profil; dipakai sebagai cache key agar teks CV tidak di-hash setiap rerun"""
+    return hashlib.blake2b(profil_teks.encode("utf-8"), digest_size=8).hexdigest()
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SKKNI)
+def get_skill_gap_cached(profil_hash: str, okupasi_id: str, _profil_teks: str) -> dict:
+    """Skill gap analysis per (profil, okupasi); keyed on profil_hash, `_profil_teks` tidak di-hash"""
+    matcher = init_matcher()
+    if not matcher:
+        return {}
+    return matcher.calculate_skill_gap(extract_skill_tokens(_profil_teks), okupasi_id)
+
+# Kata pendek / stopword di nama okupasi akan match hampir semua judul course
+COURSE_KEYWORD_MIN_LEN = 3
+COURSE_KEYWORD_STOPWORDS = SKILL_STOPWORDS | {'atau'}
+MAX_RECOMMENDED_COURSES = 50
+
+def course_keywords(okupasi_nama: str) -> frozenset:
+    """Keyword filter course dari nama okupasi (tanpa stopword & token terlalu pendek)"""
+    return frozenset(
+        w for w in okupasi_nama.lower().split()
+        if len(w) >= COURSE_KEYWORD_MIN_LEN and w not in COURSE_KEYWORD_STOPWORDS
+    )
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_COURSES)
+def get_recommended_courses_cached(okupasi_nama: str) -> list:
+    """Course yang judulnya mengandung kata dari nama okupasi (maks MAX_RECOMMENDED_COURSES)"""
+    matcher = init_matcher()
+    keywords = course_keywords(okupasi_nama)
+    if not matcher or not keywords:
+        return []
+    return filter_courses_by_keywords(matcher.df_courses, keywords)[:MAX_RECOMMENDED_COURSES]
+
 # ========================================
 # CONTINUE TO PART 3/5
 # Part 3 akan berisi Sidebar & Profil Talenta Page
@@ -460,9 +683,9 @@ def page_profil_talenta():
         with st.spinner("Memproses CV..."):
             try:
                 if uploaded_file.type == "application/pdf":
-                    raw_text = extract_text_from_pdf(io.BytesIO(uploaded_file.getvalue()))
+                    raw_text = extract_text_from_pdf(uploaded_file.getvalue())
                 elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                    raw_text = extract_text_from_docx(io.BytesIO(uploaded_file.getvalue()))
+                    raw_text = extract_text_from_docx(uploaded_file.getvalue())
                 else:
                     raw_text = uploaded_file.getvalue().decode("utf-8", errors='ignore')
                 
@@ -514,11 +737,18 @@ def page_profil_talenta():
             st.session_state.form_linkedin = linkedin
             st.session_state.form_cv_text = raw_cv
             st.session_state.profil_teks = raw_cv
-            
-            st.session_state.profil_teks = raw_cv
+            st.session_state.profil_hash = hash_profile_text(raw_cv)
             
             with st.spinner("🔍 Mapping ke SKKNI..."):
-                recommendations = map_profile_semantically(raw_cv, k=3)
+                # Warm-up matcher (baca Excel) paralel dengan encode + FAISS search,
+                # supaya tombol "Pilih Ini" tidak menunggu load matcher setelahnya
+                with ThreadPoolExecutor(
+                    max_workers=1,
+                    initializer=add_script_run_ctx,
+                    initargs=(None, get_script_run_ctx())
+                ) as executor:
+                    executor.submit(init_matcher)
+                    recommendations = map_profile_semantically(raw_cv, k=3)
                 st.session_state.recommendations = recommendations
                 
                 # Reset selection if re-mapping
@@ -584,55 +814,12 @@ def page_profil_talenta():
 # PAGE 2: CAREER ASSISTANT
 # ========================================
 
-def page_career_assistant():
-    """Career assistant with learning path, courses, and job search"""
-    st.title("💡 Career Assistant")
-    st.caption("Learning Path → Courses → Job Search → AI Chat")
-    
-    if not st.session_state.mapped_okupasi_id:
-        st.warning("⚠️ Silakan lengkapi profil terlebih dahulu.")
-        
-        if st.button("🔙 Kembali ke Profil Talenta"):
-            st.session_state.current_page = "Profil Talenta"
-            st.rerun()
-        return
-    
-    # Tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "🎯 SKKNI Info",
-        "📚 Rekomendasi Courses",
-        "💼 Job Search",
-        "💬 AI Career Chat"
-    ])
-    
-    # TAB 1: SKKNI Info
-    with tab1:
-        render_skkni_info()
-    
-    # TAB 2: Learning Path & Courses
-    with tab2:
-        render_learning_path_courses()
-    
-    # TAB 3: Job Search
-    with tab3:
-        render_job_search()
-    
-    # TAB 4: AI Chat
-    with tab4:
-        render_ai_career_chat()
-
-
-
-def render_learning_path_courses():
-    """Render learning path and course recommendations"""
-    # Hapus judul utama ini
-    # st.markdown("### 📚 Learning Path & Rekomendasi Course")
-    
-def render_learning_path_courses():
+def render_learning_path_courses(matcher=None):
     """Render course recommendations only"""
     st.markdown("### 📚 Rekomendasi Courses")
     
-    matcher = init_matcher()
+    if matcher is None:
+        matcher = init_matcher()
     if not matcher:
         st.error("⚠️ Matcher tidak tersedia.")
         return
@@ -642,12 +829,15 @@ def render_learning_path_courses():
         st.warning(f"⚠️ Data course belum tersedia. Tambahkan sheet **'{SHEET_COURSE}'** di file Excel.")
         return
     
-    # Extract keywords
+    # Filter courses by okupasi name keywords (cached per okupasi)
     okupasi_nama = st.session_state.mapped_okupasi_nama or ""
-    all_keywords = set(word.lower() for word in okupasi_nama.split() if word)
+    if not course_keywords(okupasi_nama):
+        # Nama okupasi tidak punya keyword yang berarti: tampilkan katalog lengkap
+        st.info("ℹ️ Tidak ada keyword yang cukup spesifik dari okupasi. Menampilkan semua course.")
+        display_all_courses(matcher.df_courses)
+        return
     
-    # Filter courses
-    recommended_courses = filter_courses_by_keywords(matcher.df_courses, all_keywords)
+    recommended_courses = get_recommended_courses_cached(okupasi_nama)
     
     if not recommended_courses:
         # Empty State - No Fallback
@@ -657,71 +847,27 @@ def render_learning_path_courses():
         st.success(f"🎯 Ditemukan {len(recommended_courses)} course yang relevan!")
         display_courses_table(recommended_courses)
 
-def filter_courses_by_keywords(df_courses, keywords):
-    """Filter courses based on keywords in Title"""
-    if df_courses is None or df_courses.empty:
-        return []
-    
-    filtered_courses = []
-    
-    for idx, row in df_courses.iterrows():
-        title = str(row.get('Title', '')).lower()
-        
-        # Check if any keyword exists in title
-        for keyword in keywords:
-            if keyword in title:
-                course_data = {
-                    'CourseID': row.get('CourseID', 'N/A'),
-                    'Title': row.get('Title', 'N/A'),
-                    'Platform': row.get('Platform', 'N/A'),
-                    'Jenis': row.get('Jenis', 'N/A'),
-                    'URL': row.get('URL', '#'),
-                    'matched_keyword': keyword
-                }
-                filtered_courses.append(course_data)
-                break  # Only add once per course
-    
-    return filtered_courses
-
+# Hanya course teratas yang dirender sebagai kartu "featured"; sisanya satu st.dataframe
+MAX_COURSE_CARDS = 1
 
 def display_courses_table(courses):
-    """Display recommended courses in card format"""
-    # Display in expandable cards
+    """Display the featured course as a card and all remaining courses as one table"""
     display_columns = ['CourseID', 'Title', 'Platform', 'Jenis', 'URL', 'matched_keyword']
+    df = pd.DataFrame(courses, columns=display_columns)
     
-    # Custom CSS for cards
-    st.markdown("""
-    <style>
-    .course-card-header {
-        font-size: 1.1rem;
-        font-weight: 600;
-        margin-bottom: 0.5rem;
-    }
-    .course-card-meta {
-        font-size: 0.9rem;
-        color: #ddd;
-    }
-    .keyword-badge {
-        background-color: rgba(57, 255, 20, 0.1);
-        padding: 2px 6px;
-        border-radius: 4px;
-        font-size: 0.8em;
-        color: #39ff14;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Card CSS (course-card-header, keyword-badge) lives in APP_CSS
 
-    # Display in cards
-    for i, course in enumerate(courses, 1):
+    # Featured course card(s)
+    for i, course in enumerate(df.head(MAX_COURSE_CARDS).itertuples(index=False), 1):
         with st.container(border=True):
             # Header
             col1, col2 = st.columns([3, 1])
             with col1:
-                st.markdown(f"<div class='course-card-header'>{i}. {course['Title']}</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='course-card-header'>{i}. {course.Title}</div>", unsafe_allow_html=True)
                 
             with col2:
-                if course['URL'] and course['URL'] != '#':
-                    st.link_button("🔗 Buka Course", course['URL'], use_container_width=True)
+                if course.URL and course.URL != '#':
+                    st.link_button("🔗 Buka Course", course.URL, use_container_width=True)
             
             st.markdown("---")
             
@@ -729,16 +875,30 @@ def display_courses_table(courses):
             col_det1, col_det2 = st.columns(2)
             
             with col_det1:
-                st.markdown(f"**Course ID:** {course['CourseID']}")
-                st.markdown(f"**Platform:** {course['Platform']}")
+                st.markdown(f"**Course ID:** {course.CourseID}")
+                st.markdown(f"**Platform:** {course.Platform}")
                 
             with col_det2:
-                st.markdown(f"**Jenis:** {course['Jenis']}")
-                st.markdown(f"**Matched Keyword:** <span class='keyword-badge'>{course['matched_keyword']}</span>", unsafe_allow_html=True)
-
-# ========================================
-# PAGE 2: CAREER ASSISTANT
-# ========================================
+                st.markdown(f"**Jenis:** {course.Jenis}")
+                st.markdown(f"**Matched Keyword:** <span class='keyword-badge'>{course.matched_keyword}</span>", unsafe_allow_html=True)
+
+    # Remaining courses in a single table
+    remaining = df.iloc[MAX_COURSE_CARDS:]
+    if not remaining.empty:
+        st.markdown(f"#### 📋 {len(remaining)} Course Lainnya")
+        st.dataframe(
+            remaining,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "CourseID": st.column_config.TextColumn("Course ID", width="small"),
+                "Title": st.column_config.TextColumn("Title", width="large"),
+                "Platform": st.column_config.TextColumn("Platform", width="medium"),
+                "Jenis": st.column_config.TextColumn("Jenis", width="small"),
+                "URL": st.column_config.LinkColumn("URL", width="small"),
+                "matched_keyword": st.column_config.TextColumn("Matched Keyword", width="small")
+            }
+        )
 
 def page_career_assistant():
     """Career assistant with learning path, courses, and job search"""
@@ -753,6 +913,9 @@ def page_career_assistant():
             st.rerun()
         return
     
+    # Resolve matcher once per rerun and share it across tabs
+    matcher = init_matcher()
+    
     # Tabs
     tab1, tab2, tab3, tab4 = st.tabs([
         "🎯 SKKNI Info",
@@ -763,42 +926,56 @@ def page_career_assistant():
     
     # TAB 1: SKKNI Info
     with tab1:
-        render_skkni_info()
+        render_skkni_info(matcher)
     
     # TAB 2: Learning Path & Courses
     with tab2:
-        render_learning_path_courses()
+        render_learning_path_courses(matcher)
     
     # TAB 3: Job Search
     with tab3:
-        render_job_search()
+        render_job_search(matcher)
     
     # TAB 4: AI Chat
     with tab4:
         render_ai_career_chat()
 
-def render_skkni_info():
+_OKUPASI_CARD_HTML = """
+<div class='okupasi-card'>
+    <div style='font-size: 3em;'>👔</div>
+    <div style='font-size: 1.5em; font-weight: bold; margin-top: 10px;'>
+        {nama}
+    </div>
+    <div style='font-size: 0.9em; margin-top: 5px; opacity: 0.9;'>
+        {okupasi_id}
+    </div>
+</div>
+"""
+
+@functools.lru_cache(maxsize=64)
+def _okupasi_card_html(nama: str, okupasi_id: str) -> str:
+    """HTML kartu okupasi terpilih, dibangun sekali per okupasi"""
+    return _OKUPASI_CARD_HTML.format(nama=nama, okupasi_id=okupasi_id)
+
+def render_skkni_info(matcher=None):
     """Render SKKNI information and skill gap analysis"""
     st.markdown("### 🎯 Okupasi Anda")
     
-    matcher = init_matcher()
+    if matcher is None:
+        matcher = init_matcher()
     if matcher and st.session_state.okupasi_info:
         okupasi_details = st.session_state.okupasi_info
         
         col1, col2 = st.columns([1, 2])
         
         with col1:
-            st.markdown(f"""
-            <div class='okupasi-card'>
-                <div style='font-size: 3em;'>👔</div>
-                <div style='font-size: 1.5em; font-weight: bold; margin-top: 10px;'>
-                    {okupasi_details.get('okupasi_nama', 'N/A')}
-                </div>
-                <div style='font-size: 0.9em; margin-top: 5px; opacity: 0.9;'>
-                    {okupasi_details.get('okupasi_id', 'N/A')}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(
+                _okupasi_card_html(
+                    str(okupasi_details.get('okupasi_nama', 'N/A')),
+                    str(okupasi_details.get('okupasi_id', 'N/A'))
+                ),
+                unsafe_allow_html=True
+            )
         
         with col2:
             st.markdown(f"**Area:** {okupasi_details.get('area_fungsi', 'N/A')}")
@@ -817,8 +994,11 @@ def render_skkni_info():
         st.markdown("---")
         st.markdown("### 📊 Skill Gap Analysis")
         
-        user_skills = extract_skill_tokens(st.session_state.profil_teks)
-        gap_analysis = matcher.calculate_skill_gap(user_skills, st.session_state.mapped_okupasi_id)
+        gap_analysis = get_skill_gap_cached(
+            st.session_state.profil_hash,
+            st.session_state.mapped_okupasi_id,
+            st.session_state.profil_teks
+        )
         
         col_gap1, col_gap2 = st.columns(2)
         
@@ -845,31 +1025,53 @@ def render_skkni_info():
 
 
 
+# Kolom course yang ditampilkan beserta default jika kolom tidak ada di sheet
+COURSE_COLUMN_DEFAULTS = {
+    'CourseID': 'N/A',
+    'Title': 'N/A',
+    'Platform': 'N/A',
+    'Jenis': 'N/A',
+    'URL': '#'
+}
+
+@functools.lru_cache(maxsize=128)
+def _keyword_alternation(keywords: frozenset) -> str:
+    """Longest-first regex alternation for a keyword set (built once per okupasi).
+
+    Returned as a pattern string, not a compiled object, so it works with both
+    object and Arrow-backed string dtypes in ``Series.str.extract``.
+    """
+    return "(" + "|".join(re.escape(k) for k in sorted(keywords, key=lambda k: (-len(k), k))) + ")"
+
 def filter_courses_by_keywords(df_courses, keywords):
-    """Filter courses based on keywords in Title"""
-    if df_courses is None or df_courses.empty:
+    """Filter courses based on keywords in Title (vectorized substring match)"""
+    if df_courses is None or df_courses.empty or 'Title' not in df_courses:
         return []
     
-    filtered_courses = []
+    keywords = frozenset(k for k in keywords if k)
+    if not keywords:
+        return []
     
-    for idx, row in df_courses.iterrows():
-        title = str(row.get('Title', '')).lower()
-        
-        # Check if any keyword exists in title
-        for keyword in keywords:
-            if keyword in title:
-                course_data = {
-                    'CourseID': row.get('CourseID', 'N/A'),
-                    'Title': row.get('Title', 'N/A'),
-                    'Platform': row.get('Platform', 'N/A'),
-                    'Jenis': row.get('Jenis', 'N/A'),
-                    'URL': row.get('URL', '#'),
-                    'matched_keyword': keyword
-                }
-                filtered_courses.append(course_data)
-                break  # Only add once per course
+    # Satu alternation untuk semua keyword; substring match seperti sebelumnya
+    pattern = _keyword_alternation(keywords)
+    if '_title_lower' in df_courses:
+        titles = df_courses['_title_lower']
+    else:
+        titles = df_courses['Title'].astype(str).str.lower()
+    matched = titles.str.extract(pattern, expand=False)
+    mask = matched.notna()
+    if not mask.any():
+        return []
+    
+    filtered = df_courses.loc[mask].reindex(columns=list(COURSE_COLUMN_DEFAULTS))
+    for col, default in COURSE_COLUMN_DEFAULTS.items():
+        if col not in df_courses:
+            filtered[col] = default
+    # Sel kosong jadi default (Arrow dtype memberi pd.NA yang tidak bisa dipakai di `if`)
+    filtered = filtered.astype(object).fillna(COURSE_COLUMN_DEFAULTS)
+    filtered['matched_keyword'] = matched[mask]
     
-    return filtered_courses
+    return filtered.to_dict('records')
 
 def display_all_courses(df_courses):
     """Display all available courses in table format"""
@@ -877,7 +1079,7 @@ def display_all_courses(df_courses):
         return
     
     # Select only required columns
-    display_df = df_courses[['CourseID', 'Title', 'Platform', 'Jenis', 'URL']].copy()
+    display_df = df_courses[['CourseID', 'Title', 'Platform', 'Jenis', 'URL']]
     
     # Display as table
     st.dataframe(
@@ -905,16 +1107,60 @@ def display_all_courses(df_courses):
 # JOB SEARCH TAB (FIXED VERSION)
 # ========================================
 
-def render_job_search():
+class Portal(NamedTuple):
+    """Job portal statis. Placeholder url_tmpl: {kw} = keyword ter-quote_plus,
+    {slug_title} / {slug} = keyword sebagai path slug"""
+    name: str
+    url_tmpl: str
+    color: str
+    icon: str
+    desc: str
+
+PORTALS = (
+    Portal("LinkedIn", "https://www.linkedin.com/jobs/search/?keywords={kw}&location=Indonesia",
+           "#0077B5", "🔵", "Platform profesional terbesar untuk mencari lowongan kerja di berbagai industri."),
+    Portal("Jobstreet", "https://id.jobstreet.com/id/{slug_title}-jobs",
+           "#FF6B35", "🟠", "Portal lowongan kerja terpopuler di Indonesia dan Asia Tenggara."),
+    Portal("Glints", "https://glints.com/id/opportunities/jobs/explore?keyword={kw}&country=ID&locationName=All+Cities%2FProvinces",
+           "#FD5631", "🔴", "Platform talent ecosystem untuk profesional muda di Asia."),
+    Portal("Indeed", "https://id.indeed.com/jobs?q={kw}&l=Indonesia",
+           "#2164F3", "🌐", "Mesin pencari lowongan kerja terbesar di dunia."),
+    Portal("Kalibrr", "https://www.kalibrr.com/id-ID/home/te/{slug}",
+           "#00C48C", "💼", "Platform rekrutmen modern dengan fitur AI matching."),
+)
+
+def slugify(text: str) -> str:
+    """Keyword -> path slug: whitespace jadi '-', karakter lain di-percent-encode"""
+    return quote(_WS_RE.sub('-', text.strip()), safe='-')
+
+_JOB_CARD_HTML = (
+    "<div class='job-card'>"
+    "<h3 style='color: {color};'>{icon} {name}</h3>"
+    "<p style='color: #9ca3af; font-size: 0.9em;'>{desc}</p>"
+    "<p><strong>Keyword:</strong> {keyword}</p>"
+    "</div>"
+)
+
+@functools.lru_cache(maxsize=64)
+def _job_portal_grid_html(primary_keyword: str) -> str:
+    """HTML grid kartu portal, dibangun sekali per keyword"""
+    cards = "".join(
+        _JOB_CARD_HTML.format(color=p.color, icon=p.icon, name=p.name, desc=p.desc, keyword=primary_keyword)
+        for p in PORTALS
+    )
+    return f"<div class='job-portal-grid'>{cards}</div>"
+
+def render_job_search(matcher=None):
     """Render job search portals, Google CSE, and RSS feed recommendations"""
     st.markdown("### 💼 Pencarian Lowongan Kerja")
     
-    matcher = init_matcher()
+    if matcher is None:
+        matcher = init_matcher()
     if not matcher:
         st.error("⚠️ Matcher tidak tersedia. Tidak bisa memberikan rekomendasi keyword.")
         return
     
-    job_keywords = matcher.get_job_search_keywords(st.session_state.mapped_okupasi_id)
+    job_keywords = get_job_search_keywords_cached(st.session_state.mapped_okupasi_id)
     
     st.markdown("#### 🔍 Keywords Rekomendasi")
     if job_keywords:
@@ -930,212 +1176,176 @@ def render_job_search():
     # TAB 1: JOB PORTALS (Original)
     # ========================================
     with tab_portal:
-        st.markdown("---")
+        _render_job_portals_tab(primary_keyword)
+    
+    # ========================================
+    # TAB 2: RSS FEED JOBS (FIXED)
+    # ========================================
+    with tab_rss:
+        _render_rss_tab()
+
+@st.fragment
+def _render_job_portals_tab(primary_keyword: str):
+    """Job portal links & Google search (fragment: widget di dalamnya tidak rerun seluruh app)"""
+    st.markdown("---")
+    
+    # Prepare URLs
+    primary_keyword_encoded = quote_plus(primary_keyword)
+    url_params = {
+        "kw": primary_keyword_encoded,
+        "slug_title": slugify(primary_keyword.title()),
+        "slug": slugify(primary_keyword.lower())
+    }
+    
+    # Display job portals
+    st.markdown("#### 🌐 Portal Lowongan Kerja")
+
+    # Semua kartu portal dirender dalam satu grid (satu st.markdown)
+    st.markdown(_job_portal_grid_html(primary_keyword), unsafe_allow_html=True)
+
+    # Link buttons dalam satu baris kolom
+    for col, portal in zip(st.columns(len(PORTALS)), PORTALS):
+        with col:
+            st.link_button(f"🔗 {portal.name}", portal.url_tmpl.format(**url_params), use_container_width=True)
+
+    st.markdown("---")
+    
+    # Google Custom Search
+    st.markdown("#### 🔍 Google Job Search")
+    
+    if get_api_status().get('google_cse'):
+        # Iframe + script CSE hanya dimuat setelah user memintanya
+        if st.session_state.get('cse_loaded'):
+            import streamlit.components.v1 as components
+            components.html(f"""
+            <script async src="https://cse.google.com/cse.js?cx={GOOGLE_CSE_ID}"></script>
+            <div class="gcse-search"></div>
+            """, height=400)
+        else:
+            st.button(
+                "🔍 Aktifkan Google Jobs Search",
+                use_container_width=True,
+                on_click=lambda: st.session_state.update(cse_loaded=True)
+            )
+    else:
+        st.warning("⚠️ Google CSE tidak dikonfigurasi. Gunakan link di bawah:")
+        google_jobs_url = f"https://www.google.com/search?q={primary_keyword_encoded}+jobs+indonesia"
+        st.link_button("🔍 Google Jobs Search", google_jobs_url, use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Tips
+    with st.expander("💡 Tips Pencarian Lowongan"):
+        st.markdown("""
+        **Tips untuk mendapatkan hasil terbaik:**
         
-        # Prepare URLs
-        primary_keyword_encoded = primary_keyword.replace(" ", "+")
+        1. **Update profil Anda** di setiap platform agar mudah ditemukan recruiter
+        2. **Gunakan filter** untuk menyaring berdasarkan:
+           - Lokasi kerja (remote/onsite/hybrid)
+           - Tingkat pengalaman
+           - Gaji yang diharapkan
+           - Jenis pekerjaan (full-time/part-time/contract)
         
-        # Job portal URLs
-        job_portals = {
-            "LinkedIn": {
-                "url": f"https://www.linkedin.com/jobs/search/?keywords={primary_keyword_encoded}&location=Indonesia",
-                "color": "#0077B5",
-                "icon": "🔵",
-                "description": "Platform profesional terbesar untuk mencari lowongan kerja di berbagai industri."
-            },
-            "Jobstreet": {
-                "url": f"https://id.jobstreet.com/id/{primary_keyword.title().replace(' ', '-')}-jobs",
-                "color": "#FF6B35",
-                "icon": "🟠",
-                "description": "Portal lowongan kerja terpopuler di Indonesia dan Asia Tenggara."
-            },
-            "Glints": {
-                "url": f"https://glints.com/id/opportunities/jobs/explore?keyword={primary_keyword_encoded}&country=ID&locationName=All+Cities%2FProvinces",
-                "color": "#FD5631",
-                "icon": "🔴",
-                "description": "Platform talent ecosystem untuk profesional muda di Asia."
-            },
-            "Indeed": {
-                "url": f"https://id.indeed.com/jobs?q={primary_keyword_encoded}&l=Indonesia",
-                "color": "#2164F3",
-                "icon": "🌐",
-                "description": "Mesin pencari lowongan kerja terbesar di dunia."
-            },
-            "Kalibrr": {
-                "url": f"https://www.kalibrr.com/id-ID/home/te/{primary_keyword.lower().replace(' ', '-')}",
-                "color": "#00C48C",
-                "icon": "💼",
-                "description": "Platform rekrutmen modern dengan fitur AI matching."
-            }
-        }
+        3. **Set Job Alert** di masing-masing platform untuk notifikasi lowongan baru
+        4. **Sesuaikan CV** dengan job description yang Anda lamar
+        5. **Network aktif** di LinkedIn untuk meningkatkan visibility
         
-        # Display job portals
-        st.markdown("#### 🌐 Portal Lowongan Kerja")
+        **Boolean Search Tips:**
+        - Gunakan tanda kutip untuk exact match: `"Data Scientist"`
+        - Gunakan OR untuk variasi: `Data Scientist OR Machine Learning Engineer`
+        - Gunakan minus untuk exclude: `Data Scientist -Intern`
+        """)
+
+@st.fragment
+def _render_rss_tab():
+    """RSS remote job recommendations (fragment: pagination hanya rerun tab ini)"""
+    # st.info("🔄 Memuat modul RSS Job Matcher...")
+    
+    try:
+        # Import RSS job matcher
+        from rss_job_matcher import render_rss_job_recommendations
         
-        # First row: LinkedIn, Jobstreet, Glints
-        col1, col2, col3 = st.columns(3)
+        # st.success("✅ Modul RSS berhasil dimuat!")
         
-        for idx, (portal_name, portal_info) in enumerate(list(job_portals.items())[:3]):
-            col = [col1, col2, col3][idx]
-            with col:
-                st.markdown(f"""
-                <div class='job-card'>
-                    <h3 style='color: {portal_info["color"]};'>{portal_info["icon"]} {portal_name}</h3>
-                    <p style='color: #9ca3af; font-size: 0.9em;'>{portal_info["description"]}</p>
-                    <p><strong>Keyword:</strong> {primary_keyword}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.link_button(f"🔗 {portal_name}", portal_info["url"], use_container_width=True)
+        # Get user skills from profile
+        user_skills = extract_skill_tokens(st.session_state.profil_teks)
         
-        st.markdown("---")
+        # Debug: Show extracted skills
+        if not user_skills:
+            st.warning("⚠️ Tidak ada skills yang terdeteksi dari profil Anda")
+            st.info("💡 Pastikan Anda sudah mengisi CV/Deskripsi Diri dengan lengkap di tab 'Profil Talenta'")
+        else:
+            pass # st.info(f"✅ Terdeteksi {len(user_skills)} skills dari profil Anda")
         
-        # Second row: Indeed, Kalibrr
-        col4, col5 = st.columns(2)
+        # Get okupasi info
+        okupasi_nama = st.session_state.mapped_okupasi_nama
+        if not okupasi_nama:
+            st.warning("⚠️ Okupasi belum dipetakan")
+            st.info("💡 Silakan lengkapi profil di tab 'Profil Talenta' terlebih dahulu")
+            return
         
-        for idx, (portal_name, portal_info) in enumerate(list(job_portals.items())[3:]):
-            col = [col4, col5][idx]
-            with col:
-                st.markdown(f"""
-                <div class='job-card'>
-                    <h3 style='color: {portal_info["color"]};'>{portal_info["icon"]} {portal_name}</h3>
-                    <p style='color: #9ca3af; font-size: 0.9em;'>{portal_info["description"]}</p>
-                    <p><strong>Keyword:</strong> {primary_keyword}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.link_button(f"🔗 {portal_name}", portal_info["url"], use_container_width=True)
+        unit_kompetensi = st.session_state.okupasi_info.get('unit_kompetensi', '')
         
+        # Show what will be searched
         st.markdown("---")
-        
-        # Google Custom Search
-        st.markdown("#### 🔍 Google Job Search")
-        
-        if get_api_status().get('google_cse'):
-            st.components.v1.html(f"""
-            <script async src="https://cse.google.com/cse.js?cx={GOOGLE_CSE_ID}"></script>
-            <div class="gcse-search"></div>
-            """, height=400)
-        else:
-            st.warning("⚠️ Google CSE tidak dikonfigurasi. Gunakan link di bawah:")
-            google_jobs_url = f"https://www.google.com/search?q={primary_keyword_encoded}+jobs+indonesia"
-            st.link_button("🔍 Google Jobs Search", google_jobs_url, use_container_width=True)
+        col_info1, col_info2 = st.columns(2)
+        with col_info1:
+            st.metric("Okupasi", okupasi_nama)
+            st.metric("Skills Detected", len(user_skills))
+        with col_info2:
+            st.metric("Unit Kompetensi", "✅" if unit_kompetensi else "❌")
         
         st.markdown("---")
         
-        # Tips
-        with st.expander("💡 Tips Pencarian Lowongan"):
-            st.markdown("""
-            **Tips untuk mendapatkan hasil terbaik:**
-            
-            1. **Update profil Anda** di setiap platform agar mudah ditemukan recruiter
-            2. **Gunakan filter** untuk menyaring berdasarkan:
-               - Lokasi kerja (remote/onsite/hybrid)
-               - Tingkat pengalaman
-               - Gaji yang diharapkan
-               - Jenis pekerjaan (full-time/part-time/contract)
-            
-            3. **Set Job Alert** di masing-masing platform untuk notifikasi lowongan baru
-            4. **Sesuaikan CV** dengan job description yang Anda lamar
-            5. **Network aktif** di LinkedIn untuk meningkatkan visibility
-            
-            **Boolean Search Tips:**
-            - Gunakan tanda kutip untuk exact match: `"Data Scientist"`
-            - Gunakan OR untuk variasi: `Data Scientist OR Machine Learning Engineer`
-            - Gunakan minus untuk exclude: `Data Scientist -Intern`
-            """)
+        # Render RSS job recommendations
+        render_rss_job_recommendations(
+            user_skills=user_skills,
+            okupasi_nama=okupasi_nama,
+            unit_kompetensi=unit_kompetensi,
+            okupasi_info=st.session_state.okupasi_info
+        )
     
-    # ========================================
-    # TAB 2: RSS FEED JOBS (FIXED)
-    # ========================================
-    with tab_rss:
-        # st.info("🔄 Memuat modul RSS Job Matcher...")
+    except ImportError as e:
+        st.error(f"❌ Modul `rss_job_matcher.py` tidak ditemukan!")
+        st.error(f"Detail error: {str(e)}")
         
-        try:
-            # Import RSS job matcher
-            from rss_job_matcher import render_rss_job_recommendations
-            
-            # st.success("✅ Modul RSS berhasil dimuat!")
-            
-            # Get user skills from profile
-            user_skills = extract_skill_tokens(st.session_state.profil_teks)
-            
-            # Debug: Show extracted skills
-            if not user_skills:
-                st.warning("⚠️ Tidak ada skills yang terdeteksi dari profil Anda")
-                st.info("💡 Pastikan Anda sudah mengisi CV/Deskripsi Diri dengan lengkap di tab 'Profil Talenta'")
-            else:
-                pass # st.info(f"✅ Terdeteksi {len(user_skills)} skills dari profil Anda")
+        with st.expander("📋 Cara Mengaktifkan RSS Job Feed", expanded=True):
+            st.markdown("""
+            **Langkah-langkah aktivasi:**
             
-            # Get okupasi info
-            okupasi_nama = st.session_state.mapped_okupasi_nama
-            if not okupasi_nama:
-                st.warning("⚠️ Okupasi belum dipetakan")
-                st.info("💡 Silakan lengkapi profil di tab 'Profil Talenta' terlebih dahulu")
-                return
+            1. **Download file `rss_job_matcher.py`** dari artifact yang saya berikan
             
-            unit_kompetensi = st.session_state.okupasi_info.get('unit_kompetensi', '')
+            2. **Simpan file di folder yang sama dengan `app.py`**
+               ```
+               project/
+               ├── app.py
+               ├── rss_job_matcher.py  ← FILE INI
+               ├── config.py
+               └── ...
+               ```
             
-            # Show what will be searched
-            st.markdown("---")
-            col_info1, col_info2 = st.columns(2)
-            with col_info1:
-                st.metric("Okupasi", okupasi_nama)
-                st.metric("Skills Detected", len(user_skills))
-            with col_info2:
-                st.metric("Unit Kompetensi", "✅" if unit_kompetensi else "❌")
+            3. **Install dependencies:**
+               ```bash
+               pip install feedparser beautifulsoup4 lxml
+               ```
             
-            st.markdown("---")
-            
-            # Render RSS job recommendations
-            render_rss_job_recommendations(
-                user_skills=user_skills,
-                okupasi_nama=okupasi_nama,
-                unit_kompetensi=unit_kompetensi,
-                okupasi_info=st.session_state.okupasi_info
-            )
-        
-        except ImportError as e:
-            st.error(f"❌ Modul `rss_job_matcher.py` tidak ditemukan!")
-            st.error(f"Detail error: {str(e)}")
+            4. **Restart aplikasi Streamlit:**
+               ```bash
+               streamlit run app.py
+               ```
             
-            with st.expander("📋 Cara Mengaktifkan RSS Job Feed", expanded=True):
-                st.markdown("""
-                **Langkah-langkah aktivasi:**
-                
-                1. **Download file `rss_job_matcher.py`** dari artifact yang saya berikan
-                
-                2. **Simpan file di folder yang sama dengan `app.py`**
-                   ```
-                   project/
-                   ├── app.py
-                   ├── rss_job_matcher.py  ← FILE INI
-                   ├── config.py
-                   └── ...
-                   ```
-                
-                3. **Install dependencies:**
-                   ```bash
-                   pip install feedparser beautifulsoup4 lxml
-                   ```
-                
-                4. **Restart aplikasi Streamlit:**
-                   ```bash
-                   streamlit run app.py
-                   ```
-                
-                **Verifikasi instalasi:**
-                - Cek apakah file `rss_job_matcher.py` ada
-                - Cek apakah semua dependencies terinstall
-                - Restart Streamlit setelah menambahkan file
-                """)
+            **Verifikasi instalasi:**
+            - Cek apakah file `rss_job_matcher.py` ada
+            - Cek apakah semua dependencies terinstall
+            - Restart Streamlit setelah menambahkan file
+            """)
+    
+    except Exception as e:
+        st.error(f"❌ Error saat memuat RSS jobs: {str(e)}")
+        st.exception(e)
         
-        except Exception as e:
-            st.error(f"❌ Error saat memuat RSS jobs: {str(e)}")
-            st.exception(e)
-            
-            with st.expander("🐛 Debug Information"):
-                st.code(f"""
+        with st.expander("🐛 Debug Information"):
+            st.code(f"""
 Error Type: {type(e).__name__}
 Error Message: {str(e)}
 
@@ -1144,9 +1354,10 @@ Session State Info:
 - Okupasi Nama: {st.session_state.get('mapped_okupasi_nama', 'Not set')}
 - Profil Text Length: {len(st.session_state.get('profil_teks', ''))}
 - Skills Count: {len(extract_skill_tokens(st.session_state.profil_teks))}
-                """)
-            
-            st.info("💡 Coba refresh halaman atau hubungi administrator jika masalah berlanjut.")
+            """)
+        
+        st.info("💡 Coba refresh halaman atau hubungi administrator jika masalah berlanjut.")
+
 # ========================================
 # AI CAREER CHAT TAB
 # ========================================
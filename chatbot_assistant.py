@@ -5,40 +5,83 @@ Dengan manajemen token yang efisien
 """
 
 import streamlit as st
+import numpy as np
 import requests
 import json
-from typing import List, Dict, Optional
+import time
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+from typing import List, Dict, Optional, Iterator, NamedTuple
 from datetime import datetime
 
-from config import GEMINI_API_KEY, GEMINI_MODEL
+from config import GEMINI_MODEL, get_gemini_api_key
+from utils.http_session import get_http_session
+from utils.embeddings import load_query_encoder
 
 
-class CareerChatbot:
-    """AI Career Assistant menggunakan Gemini API"""
+@functools.lru_cache(maxsize=1)
+def _get_token_encoder():
+    """Encoder tiktoken (BPE) dimuat saat pertama dipakai, bukan saat import.
+
+    get_encoding bisa mengunduh file BPE tanpa timeout; None jika tiktoken
+    tidak terinstall atau unduhan gagal (fallback ke estimasi karakter).
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+# Koneksi ke Gemini dipakai ulang lewat session bersama (get_http_session)
+_JSON_HEADERS = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+
+@functools.lru_cache(maxsize=2048)
+def count_tokens(text: str) -> int:
+    """Jumlah token teks; di-cache karena system prompt & saran pertanyaan berulang"""
+    enc = _get_token_encoder()
+    if enc is not None:
+        return len(enc.encode(text))
+    return len(text) // 3  # rasio BPE bahasa Indonesia ~2.8 karakter/token
+
+
+SUMMARY_PROMPT = "Ringkas percakapan berikut dalam 50 kata, pertahankan fakta kunci tentang profil user:"
+
+
+class _ChatRequest(NamedTuple):
+    """Hasil persiapan satu turn chat: payload API atau jawaban dari cache"""
+    payload: Optional[dict]
+    cache_key: Optional[str]
+    namespace: str
+    query_emb: Optional[np.ndarray]
+    cached: Optional[str]
+
+
+def _profile_key(user_profile: dict) -> tuple:
+    """Bagian profil yang menentukan system prompt, sebagai tuple hashable"""
+    return (
+        user_profile.get('okupasi_nama', 'Tidak diketahui'),
+        user_profile.get('skill_gap', 'Tidak ada data'),
+        user_profile.get('lokasi', 'Indonesia')
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _build_system_prompt_cached(okupasi: str, skill_gap: str, lokasi: str) -> str:
+    """
+    Build system prompt dengan informasi user yang ringkas.
+    Di-cache per profil: string yang sama persis tiap turn juga menjaga
+    prefix prompt tetap stabil untuk prompt caching di sisi Gemini.
+    """
+    # Ringkas skill gap jika terlalu panjang
+    if len(skill_gap) > 200:
+        skills = skill_gap.split(',')[:5]
+        skill_gap = ', '.join(skills) + '...'
     
-    def __init__(self, api_key: str, model: str = "gemini-flash-latest"):
-        self.api_key = api_key
-        self.model = model
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
-        
-        # Token limits untuk efisiensi
-        self.MAX_INPUT_TOKENS = 4000  # Batas input untuk konteks
-        self.MAX_OUTPUT_TOKENS = 800  # Batas output untuk respons
-        self.CONTEXT_WINDOW = 3  # Hanya simpan 3 pesan terakhir
-        
-    def _build_system_prompt(self, user_profile: dict) -> str:
-        """Build system prompt dengan informasi user yang ringkas"""
-        
-        okupasi = user_profile.get('okupasi_nama', 'Tidak diketahui')
-        skill_gap = user_profile.get('skill_gap', 'Tidak ada data')
-        lokasi = user_profile.get('lokasi', 'Indonesia')
-        
-        # Ringkas skill gap jika terlalu panjang
-        if len(skill_gap) > 200:
-            skills = skill_gap.split(',')[:5]
-            skill_gap = ', '.join(skills) + '...'
-        
-        prompt = f"""Anda adalah AI Career Assistant untuk platform Digital Talent.
+    return f"""Anda adalah AI Career Assistant untuk platform Digital Talent.
 
 PROFIL USER (RINGKAS):
 - Okupasi Target: {okupasi}
@@ -59,20 +102,123 @@ ATURAN:
 - Hindari penjelasan panjang, langsung ke poin penting
 
 Gaya: Profesional namun ramah, seperti career mentor."""
+
+
+class SemanticResponseCache:
+    """
+    Cache respons berbasis kemiripan embedding pertanyaan.
+    Pertanyaan yang maknanya hampir sama ("lowongan utk data scientist" vs
+    "Lowongan apa yang cocok untuk Data Scientist?") memakai jawaban yang sama.
+    Entri dipisah per namespace (digest system prompt = okupasi + skill gap + lokasi)
+    agar jawaban tidak bocor antar profil.
+    """
+    
+    def __init__(self, threshold: float = 0.92, max_entries: int = 500):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embs: Optional[np.ndarray] = None  # N x dim, sudah dinormalisasi
+        self.namespaces: List[str] = []
+        self.answers: List[str] = []
+        self._lock = threading.Lock()
+    
+    def lookup(self, emb: np.ndarray, namespace: str) -> Optional[str]:
+        """Kembalikan jawaban dengan cosine similarity >= threshold di namespace yang sama"""
+        with self._lock:
+            if self.embs is None:
+                return None
+            sims = self.embs @ emb
+            sims[np.asarray(self.namespaces) != namespace] = -1.0
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                return self.answers[best]
+            return None
+    
+    def add(self, emb: np.ndarray, namespace: str, answer: str):
+        """Tambah entri baru, buang yang tertua (FIFO) jika melebihi kapasitas"""
+        with self._lock:
+            emb = emb.reshape(1, -1).astype(np.float32, copy=False)
+            self.embs = emb if self.embs is None else np.vstack((self.embs, emb))
+            self.namespaces.append(namespace)
+            self.answers.append(answer)
+            overflow = len(self.answers) - self.max_entries
+            if overflow > 0:
+                self.embs = self.embs[overflow:]
+                del self.namespaces[:overflow]
+                del self.answers[:overflow]
+
+
+class CareerChatbot:
+    """AI Career Assistant menggunakan Gemini API"""
+    
+    def __init__(self, api_key: str, model: str = "gemini-flash-latest"):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
         
-        return prompt
+        # Token limits untuk efisiensi
+        self.MAX_INPUT_TOKENS = 4000  # Batas input untuk konteks
+        self.MAX_OUTPUT_TOKENS = 220  # ~150 kata, sesuai batas di system prompt
+        self.STOP_SEQUENCES = ["\n\n\n"]  # Potong jawaban yang mulai bertele-tele
+        self.HISTORY_SAFETY_TOKENS = 400  # Cadangan di luar system prompt & history
+        self.SUMMARY_TRIGGER_MESSAGES = 10  # Ringkas turn lama jika history lebih dari ini
+        self.SUMMARY_KEEP_RECENT = 8  # 4 pasang user-model terakhir tetap utuh
+        self.SUMMARY_BLOCK_MESSAGES = 8  # turn lama diringkas per 4 pasang (1 panggilan per 4 turn)
+        self.SUMMARY_MAX_TOKENS = 120
+        self.TEMPERATURE = 0.7
+        
+        # Cache respons (LRU + TTL) untuk pertanyaan berulang, mis. tombol saran
+        self.CACHE_TTL = 3600  # detik
+        self.CACHE_MAX_ENTRIES = 256
+        self.CACHE_MAX_TEMPERATURE = 0.7  # temperature di atas ini tidak di-cache
+        self._resp_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._resp_cache_lock = threading.Lock()
+        self._semantic_cache = SemanticResponseCache()
+        self._summary_cache: "OrderedDict[str, str]" = OrderedDict()
+        
+    def _build_system_prompt(self, user_profile: dict) -> str:
+        """Build system prompt dengan informasi user yang ringkas"""
+        return _build_system_prompt_cached(*_profile_key(user_profile))
     
-    def _truncate_history(self, messages: List[Dict]) -> List[Dict]:
-        """Potong history untuk menghemat token"""
-        if len(messages) <= self.CONTEXT_WINDOW * 2:  # user + assistant pairs
+    def _message_tokens(self, message: Dict) -> int:
+        """Estimasi token satu pesan dalam format API"""
+        return self._count_tokens_estimate(message["parts"][0]["text"])
+    
+    def _truncate_history(self, messages: List[Dict], system_instruction: str = "") -> List[Dict]:
+        """
+        Potong history berdasarkan budget token, bukan jumlah pesan.
+        Pesan user pertama selalu dipertahankan sebagai konteks, lalu diisi
+        pesan terbaru sebanyak yang muat dalam budget.
+        """
+        if not messages:
+            return []
+        
+        budget = (
+            self.MAX_INPUT_TOKENS
+            - self._count_tokens_estimate(system_instruction)
+            - self.HISTORY_SAFETY_TOKENS
+        )
+        first = messages[0]
+        used = self._message_tokens(first)
+        
+        recent = []
+        for message in reversed(messages[1:]):
+            used += self._message_tokens(message)
+            if used > budget:
+                break
+            recent.append(message)
+        
+        if len(recent) == len(messages) - 1:
             return messages
         
-        # Ambil hanya N pesan terakhir (keep user-assistant pairs)
-        return messages[-(self.CONTEXT_WINDOW * 2):]
+        # Gemini butuh role bergantian: setelah pesan user pertama harus 'model'
+        recent.reverse()
+        while recent and recent[0]["role"] == first["role"]:
+            recent.pop(0)
+        return [first] + recent
     
     def _count_tokens_estimate(self, text: str) -> int:
-        """Estimasi jumlah token (1 token ≈ 4 karakter untuk bahasa Indonesia)"""
-        return len(text) // 4
+        """Estimasi jumlah token (tiktoken jika tersedia, else ~3 karakter/token)"""
+        return count_tokens(text)
     
     def _compress_message(self, text: str, max_tokens: int = 500) -> str:
         """Kompres pesan jika terlalu panjang"""
@@ -82,9 +228,213 @@ Gaya: Profesional namun ramah, seperti career mentor."""
             return text
         
         # Potong teks dan tambahkan indikator
-        max_chars = max_tokens * 4
+        max_chars = max_tokens * 3
         return text[:max_chars] + "... [dipotong untuk efisiensi]"
     
+    def _cache_key(self, system_instruction: str, history: List[Dict], message: str) -> str:
+        """Hash dari seluruh input yang menentukan respons"""
+        raw = '\x1f'.join((
+            system_instruction,
+            json.dumps(history, sort_keys=True, ensure_ascii=False),
+            message
+        ))
+        return hashlib.md5(raw.encode('utf-8')).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Ambil respons dari cache jika masih dalam TTL"""
+        with self._resp_cache_lock:
+            entry = self._resp_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, text = entry
+            if time.time() - stored_at > self.CACHE_TTL:
+                del self._resp_cache[key]
+                return None
+            self._resp_cache.move_to_end(key)
+            return text
+    
+    def _cache_put(self, key: str, text: str):
+        """Simpan respons, buang entri tertua jika melebihi kapasitas"""
+        with self._resp_cache_lock:
+            self._resp_cache[key] = (time.time(), text)
+            self._resp_cache.move_to_end(key)
+            while len(self._resp_cache) > self.CACHE_MAX_ENTRIES:
+                self._resp_cache.popitem(last=False)
+    
+    def _request_summary(self, previous: Optional[str], turns: List[Dict]) -> Optional[str]:
+        """Satu panggilan Gemini: ringkasan sebelumnya (jika ada) + turn baru -> ringkasan baru"""
+        transcript = "\n".join(
+            f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['parts'][0]['text']}"
+            for m in turns
+        )
+        if previous:
+            transcript = f"Ringkasan sebelumnya: {previous}\n\n{transcript}"
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": f"{SUMMARY_PROMPT}\n\n{transcript}"}]}],
+            "generationConfig": {"temperature": 0.2, "maxOutputTokens": self.SUMMARY_MAX_TOKENS}
+        }
+        url = f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
+        try:
+            response = get_http_session().post(url, headers=_JSON_HEADERS, json=payload, timeout=15)
+            response.raise_for_status()
+            return self._extract_text(response.json())
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+    
+    def _summarize_old_turns(self, old: List[Dict], namespace: str) -> Optional[str]:
+        """
+        Ringkasan untuk old = [balasan model pertama] + blok-blok SUMMARY_BLOCK_MESSAGES pesan.
+        Key cache berantai per blok (diawali namespace profil), jadi ringkasan hanya berubah
+        saat satu blok penuh tergeser; blok baru dilipat ke ringkasan blok sebelumnya
+        (maks. satu panggilan API).
+        """
+        block = self.SUMMARY_BLOCK_MESSAGES
+        digest = hashlib.md5(namespace.encode('utf-8'))
+        digest.update(json.dumps(old[:1], sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        keys = []
+        for start in range(1, len(old), block):
+            digest.update(json.dumps(old[start:start + block], sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            keys.append(digest.hexdigest())
+        
+        # Cari blok terakhir yang ringkasannya sudah ada
+        summary, done = None, 0
+        with self._resp_cache_lock:
+            for i in range(len(keys) - 1, -1, -1):
+                if keys[i] in self._summary_cache:
+                    summary = self._summary_cache[keys[i]]
+                    self._summary_cache.move_to_end(keys[i])
+                    done = i + 1
+                    break
+        if done == len(keys):
+            return summary
+        
+        summary = self._request_summary(summary, old[1 + done * block:] if done else old)
+        if not summary:
+            return None
+        with self._resp_cache_lock:
+            self._summary_cache[keys[-1]] = summary
+            while len(self._summary_cache) > 32:
+                self._summary_cache.popitem(last=False)
+        return summary
+    
+    def _compact_history(self, messages: List[Dict], namespace: str) -> List[Dict]:
+        """
+        Jika history panjang, ganti turn lama dengan ringkasan:
+        [pesan user pertama, ringkasan (model), ...turn terbaru mulai dari user]
+        Yang diringkas hanya blok penuh, sisanya tetap utuh sampai bloknya lengkap.
+        """
+        if len(messages) <= self.SUMMARY_TRIGGER_MESSAGES:
+            return messages
+        
+        # messages[1] = balasan model pertama, lalu blok penuh yang sudah keluar dari jendela terbaru
+        blocks = (len(messages) - self.SUMMARY_KEEP_RECENT - 2) // self.SUMMARY_BLOCK_MESSAGES
+        if blocks < 1:
+            return messages
+        split = 2 + blocks * self.SUMMARY_BLOCK_MESSAGES
+        if messages[split]["role"] != "user":
+            return messages  # role tidak bergantian; kirim apa adanya
+        old = messages[1:split]
+        
+        summary = self._summarize_old_turns(old, namespace)
+        # Pakai ringkasan hanya jika memang lebih hemat dari turn yang digantikan
+        if summary is None or self._count_tokens_estimate(summary) >= sum(self._message_tokens(m) for m in old):
+            return messages
+        return [messages[0], {"role": "model", "parts": [{"text": "[RINGKASAN] " + summary}]}] + messages[split:]
+    
+    def _embed_query(self, text: str) -> Optional[np.ndarray]:
+        """Embedding pertanyaan untuk semantic cache; None jika model tidak tersedia"""
+        try:
+            model = load_query_encoder()
+            return model.encode(text, normalize_embeddings=True, convert_to_numpy=True)
+        except Exception:
+            return None
+    
+    def _prepare_request(self, user_message: str, user_profile: dict, chat_history: List[Dict]) -> _ChatRequest:
+        """Susun payload Gemini dan cek cache (dipakai chat() dan chat_stream())"""
+        # Compress user message
+        compressed_message = self._compress_message(user_message, max_tokens=300)
+        
+        # Build system instruction
+        system_instruction = self._build_system_prompt(user_profile)
+        
+        # Pesan saat ini sudah ada di ujung chat_history; jangan dikirim dua kali
+        history = chat_history
+        if history and history[-1]["role"] == "user" and history[-1]["parts"][0]["text"] == user_message:
+            history = history[:-1]
+        
+        # Namespace = seluruh profil yang masuk system prompt, bukan hanya okupasi:
+        # jawaban ditulis untuk skill gap & lokasi user tertentu. Semua cache di
+        # instance (dipakai bersama antar session) di-scope dengan profil ini.
+        namespace = hashlib.md5(system_instruction.encode('utf-8')).hexdigest()
+        
+        # Ringkas turn lama, lalu truncate history sesuai budget token
+        history = self._compact_history(history, namespace)
+        truncated_history = self._truncate_history(history, system_instruction)
+        
+        # Cek cache sebelum memanggil API
+        use_cache = self.TEMPERATURE <= self.CACHE_MAX_TEMPERATURE
+        cache_key = None
+        if use_cache:
+            cache_key = self._cache_key(system_instruction, truncated_history, compressed_message)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return _ChatRequest(None, cache_key, "", None, cached)
+        
+        # Semantic cache hanya untuk pertanyaan pertama: di tengah percakapan
+        # jawaban bergantung pada history, bukan hanya pada pertanyaan
+        query_emb = None
+        if use_cache and len(chat_history) <= 1:
+            query_emb = self._embed_query(compressed_message)
+            if query_emb is not None:
+                cached = self._semantic_cache.lookup(query_emb, namespace)
+                if cached is not None:
+                    return _ChatRequest(None, cache_key, namespace, None, cached)
+        
+        # Build contents
+        contents = truncated_history.copy()
+        contents.append({
+            "role": "user",
+            "parts": [{"text": compressed_message}]
+        })
+        
+        payload = {
+            "contents": contents,
+            "systemInstruction": {
+                "parts": [{"text": system_instruction}]
+            },
+            "generationConfig": {
+                "temperature": self.TEMPERATURE,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": self.MAX_OUTPUT_TOKENS,
+                "stopSequences": self.STOP_SEQUENCES
+            },
+            "safetySettings": [
+                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"}
+            ]
+        }
+        
+        return _ChatRequest(payload, cache_key, namespace, query_emb, None)
+    
+    def _store_response(self, request: _ChatRequest, text: str):
+        """Simpan respons API ke cache exact & semantic"""
+        if request.cache_key is not None:
+            self._cache_put(request.cache_key, text)
+        if request.query_emb is not None:
+            self._semantic_cache.add(request.query_emb, request.namespace, text)
+    
+    @staticmethod
+    def _extract_text(result: dict) -> Optional[str]:
+        """Ambil teks kandidat pertama dari respons (atau chunk SSE) Gemini"""
+        if "candidates" in result and len(result["candidates"]) > 0:
+            candidate = result["candidates"][0]
+            if "content" in candidate and "parts" in candidate["content"]:
+                return candidate["content"]["parts"][0].get("text")
+        return None
+    
     def chat(self, user_message: str, user_profile: dict, chat_history: List[Dict]) -> Optional[str]:
         """
         Kirim chat ke Gemini API dengan manajemen token efisien
@@ -99,63 +449,28 @@ Gaya: Profesional namun ramah, seperti career mentor."""
         """
         
         try:
-            # Compress user message
-            compressed_message = self._compress_message(user_message, max_tokens=300)
-            
-            # Truncate history untuk efisiensi
-            truncated_history = self._truncate_history(chat_history)
-            
-            # Build system instruction
-            system_instruction = self._build_system_prompt(user_profile)
+            request = self._prepare_request(user_message, user_profile, chat_history)
+            if request.cached is not None:
+                return request.cached
             
             # Prepare request
             url = f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
             
-            # Build contents
-            contents = truncated_history.copy()
-            contents.append({
-                "role": "user",
-                "parts": [{"text": compressed_message}]
-            })
-            
-            payload = {
-                "contents": contents,
-                "systemInstruction": {
-                    "parts": [{"text": system_instruction}]
-                },
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": self.MAX_OUTPUT_TOKENS,
-                    "stopSequences": []
-                },
-                "safetySettings": [
-                    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"}
-                ]
-            }
-            
             # Send request
-            response = requests.post(
+            response = get_http_session().post(
                 url,
-                headers={"Content-Type": "application/json"},
-                json=payload,
+                headers=_JSON_HEADERS,
+                json=request.payload,
                 timeout=30
             )
             
             response.raise_for_status()
-            result = response.json()
             
             # Extract response
-            if "candidates" in result and len(result["candidates"]) > 0:
-                candidate = result["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    return candidate["content"]["parts"][0]["text"]
-            
-            return None
+            text = self._extract_text(response.json())
+            if text:
+                self._store_response(request, text)
+            return text
             
         except requests.exceptions.Timeout:
             st.error("⏱️ Request timeout. Coba lagi.")
@@ -167,6 +482,54 @@ Gaya: Profesional namun ramah, seperti career mentor."""
             st.error(f"❌ Unexpected error: {str(e)}")
             return None
     
+    def chat_stream(self, user_message: str, user_profile: dict, chat_history: List[Dict]) -> Iterator[str]:
+        """
+        Versi streaming dari chat(): yield potongan teks saat diterima
+        (streamGenerateContent + SSE), untuk dipakai dengan st.write_stream.
+        Respons dari cache di-yield sekaligus.
+        """
+        
+        chunks = []
+        try:
+            request = self._prepare_request(user_message, user_profile, chat_history)
+            if request.cached is not None:
+                yield request.cached
+                return
+            
+            url = f"{self.base_url}/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+            
+            with get_http_session().post(
+                url,
+                headers=_JSON_HEADERS,
+                json=request.payload,
+                stream=True,
+                timeout=30
+            ) as response:
+                response.raise_for_status()
+                
+                # Decode manual per baris: text/event-stream tanpa charset akan
+                # di-decode requests sebagai ISO-8859-1 dan merusak emoji
+                for line in response.iter_lines():
+                    if not line.startswith(b"data:"):
+                        continue
+                    text = self._extract_text(json.loads(line[5:].decode("utf-8")))
+                    if text:
+                        chunks.append(text)
+                        yield text
+            
+        except requests.exceptions.Timeout:
+            st.error("⏱️ Request timeout. Coba lagi.")
+            return
+        except requests.exceptions.RequestException as e:
+            st.error(f"❌ API Error: {str(e)}")
+            return
+        except Exception as e:
+            st.error(f"❌ Unexpected error: {str(e)}")
+            return
+        
+        if chunks:
+            self._store_response(request, "".join(chunks))
+    
     def get_quick_suggestions(self, okupasi_nama: str) -> List[str]:
         """Generate quick suggestion buttons berdasarkan okupasi"""
         
@@ -181,6 +544,29 @@ Gaya: Profesional namun ramah, seperti career mentor."""
         return suggestions
 
 
+@st.cache_resource(show_spinner=False)
+def get_chatbot(api_key: str, model: str) -> CareerChatbot:
+    """
+    Satu CareerChatbot per (key, model) untuk seluruh proses, jadi cache
+    respons dipakai bersama antar session. Aman karena setiap key cache memuat
+    profil user (system prompt): exact cache, semantic cache (namespace) dan
+    cache ringkasan. Ganti key -> instance baru.
+    """
+    return CareerChatbot(api_key, model)
+
+
+def _queue_message(text: str):
+    """Callback tombol saran: pesan diproses pada run yang dipicu klik ini"""
+    st.session_state.pending_message = text
+
+
+def _clear_chat():
+    """Callback hapus chat: state di-reset sebelum rerun, tanpa st.rerun()"""
+    st.session_state.chat_history = []
+    st.session_state.chat_messages = []
+    st.session_state.total_tokens = 0
+
+
 def render_career_chatbot():
     """Render chatbot UI di Streamlit"""
     
@@ -192,9 +578,12 @@ def render_career_chatbot():
         st.warning("⚠️ Lengkapi profil Anda terlebih dahulu untuk mendapat rekomendasi yang akurat.")
         return
     
-    # Initialize chatbot
-    if 'chatbot' not in st.session_state:
-        st.session_state.chatbot = CareerChatbot(GEMINI_API_KEY, GEMINI_MODEL)
+    # Initialize chatbot (key dibaca tiap run: rotasi key tanpa restart)
+    api_key = get_gemini_api_key()
+    if not api_key:
+        st.warning("⚠️ Gemini API key belum di-set. Isi `GEMINI_API_KEY` di `.streamlit/secrets.toml` atau environment variable.")
+        return
+    chatbot = get_chatbot(api_key, GEMINI_MODEL)
     
     # Initialize chat history
     if 'chat_history' not in st.session_state:
@@ -203,6 +592,10 @@ def render_career_chatbot():
     if 'chat_messages' not in st.session_state:
         st.session_state.chat_messages = []
     
+    # Total token history, di-update saat pesan ditambahkan (bukan dijumlah ulang tiap rerun)
+    if 'total_tokens' not in st.session_state:
+        st.session_state.total_tokens = 0
+    
     # Prepare user profile
     user_profile = {
         'okupasi_nama': st.session_state.mapped_okupasi_nama,
@@ -217,28 +610,25 @@ def render_career_chatbot():
             with st.chat_message(msg["role"]):
                 st.markdown(msg["content"])
     
+    # Handle pending message from button click (di-set oleh callback sebelum run ini)
+    pending_message = st.session_state.pop('pending_message', None)
+    
     # Quick suggestions
-    if len(st.session_state.chat_messages) == 0:
+    if len(st.session_state.chat_messages) == 0 and pending_message is None:
         st.markdown("#### 🎯 Saran Pertanyaan:")
         
-        suggestions = st.session_state.chatbot.get_quick_suggestions(
+        suggestions = chatbot.get_quick_suggestions(
             st.session_state.mapped_okupasi_nama
         )
         
         cols = st.columns(2)
         for idx, suggestion in enumerate(suggestions[:4]):
             with cols[idx % 2]:
-                if st.button(suggestion, key=f"suggest_{idx}", use_container_width=True):
-                    st.session_state.pending_message = suggestion
-                    st.rerun()
-    
-    # Handle pending message from button click
-    if hasattr(st.session_state, 'pending_message'):
-        user_input = st.session_state.pending_message
-        delattr(st.session_state, 'pending_message')
-    else:
-        # Chat input
-        user_input = st.chat_input("Ketik pertanyaan Anda di sini...")
+                st.button(suggestion, key=f"suggest_{idx}", use_container_width=True,
+                          on_click=_queue_message, args=(suggestion,))
+    
+    # Chat input
+    user_input = st.chat_input("Ketik pertanyaan Anda di sini...") or pending_message
     
     if user_input:
         # Add user message to display
@@ -252,14 +642,18 @@ def render_career_chatbot():
             "role": "user",
             "parts": [{"text": user_input}]
         })
+        st.session_state.total_tokens += count_tokens(user_input)
         
-        # Get response
-        with st.spinner("🤔 Sedang berpikir..."):
-            response = st.session_state.chatbot.chat(
+        with st.chat_message("user"):
+            st.markdown(user_input)
+        
+        # Stream response: teks tampil bertahap begitu token pertama diterima
+        with st.chat_message("assistant"):
+            response = st.write_stream(chatbot.chat_stream(
                 user_input,
                 user_profile,
                 st.session_state.chat_history
-            )
+            ))
         
         if response:
             # Add assistant message
@@ -273,31 +667,24 @@ def render_career_chatbot():
                 "role": "model",
                 "parts": [{"text": response}]
             })
+            st.session_state.total_tokens += count_tokens(response)
         else:
             st.error("❌ Gagal mendapat respons. Coba lagi.")
         
-        st.rerun()
+        # Tidak perlu st.rerun(): bubble user & assistant sudah dirender di run ini
     
     # Clear chat button
     if len(st.session_state.chat_messages) > 0:
-        if st.button("🗑️ Hapus Chat", use_container_width=True):
-            st.session_state.chat_history = []
-            st.session_state.chat_messages = []
-            st.rerun()
+        st.button("🗑️ Hapus Chat", use_container_width=True, on_click=_clear_chat)
     
     # Token usage info
     with st.expander("ℹ️ Info Token & Efisiensi"):
-        total_tokens = sum(
-            len(msg.get("parts", [{}])[0].get("text", "")) // 4 
-            for msg in st.session_state.chat_history
-        )
-        
         st.markdown(f"""
         **Manajemen Token:**
-        - Estimasi Token Terpakai: ~{total_tokens}
-        - Batas Input: {st.session_state.chatbot.MAX_INPUT_TOKENS} tokens
-        - Batas Output: {st.session_state.chatbot.MAX_OUTPUT_TOKENS} tokens
-        - Context Window: {st.session_state.chatbot.CONTEXT_WINDOW} pesan terakhir
+        - Estimasi Token Terpakai: ~{st.session_state.total_tokens}
+        - Batas Input: {chatbot.MAX_INPUT_TOKENS} tokens
+        - Batas Output: {chatbot.MAX_OUTPUT_TOKENS} tokens
+        - Context Window: pesan pertama + pesan terbaru dalam budget input
         
         **Optimisasi:**
         - ✅ Auto-compress pesan panjang
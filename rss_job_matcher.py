@@ -1,13 +1,63 @@
-import feedparser
-from bs4 import BeautifulSoup
 import re
-from typing import List, Dict
-import streamlit as st
+import io
+import html
+import os
+import json
+import logging
+import tempfile
 import time
+from typing import List, Dict, Optional, Iterable, NamedTuple
+import numpy as np
+import streamlit as st
+import threading
+import heapq
+import functools
+import hashlib
+from collections import OrderedDict, Counter
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib.parse import urlparse, urlsplit
+
+from config import ENABLE_SEMANTIC_JOB_RANKING, SEMANTIC_JOB_RANKING_WEIGHT
+from utils.http_session import get_http_session
+from utils.embeddings import load_embedding_model, load_query_encoder
+
+# pyahocorasick: automaton Aho-Corasick (C extension), semua keyword dalam satu scan linear
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# defusedxml: parse RSS/Atom langsung via ElementTree (aman dari XXE/billion laughs),
+# jauh lebih cepat dari feedparser; feedparser tetap jadi fallback untuk feed aneh
+try:
+    from defusedxml.ElementTree import iterparse as safe_xml_iterparse
+    DEFUSEDXML_AVAILABLE = True
+except ImportError:
+    DEFUSEDXML_AVAILABLE = False
+
+# selectolax (lexbor, C extension) jauh lebih cepat dari BeautifulSoup untuk get-text
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
 
 # =====================================================================================
 # RSS FEED SOURCES
 # =====================================================================================
+FEED_CONNECT_TIMEOUT = 5  # detik; host yang tidak merespons gagal cepat
+FEED_TIMEOUT = 15  # detik per feed (read)
+FEED_CACHE_TTL = 900  # detik; dalam TTL feed tidak di-request sama sekali
+PROGRESS_UPDATES = 50  # jumlah maksimum update progress bar per proses matching
+# Batas HTML deskripsi yang dibersihkan & di-scan; deskripsi normal (2-10KB) tidak terpotong,
+# hanya feed yang menyisipkan seluruh halaman yang dibatasi
+MAX_DESCRIPTION_HTML_CHARS = 20000
+# Beberapa feed menolak User-Agent default python-requests
+FEED_USER_AGENT = "Mozilla/5.0 (compatible; DTPMXY-JobMatcher/1.0; +https://github.com/yudstrz/DTPMXY)"
+
 RSS_FEEDS = [
     "https://weworkremotely.com/remote-jobs.rss",
     "https://jobicy.com/feed/job_feed",
@@ -21,119 +71,674 @@ RSS_FEEDS = [
 # HELPER FUNCTIONS
 # =====================================================================================
 
+_WS_RE = re.compile(r"\s+")
+_TAG_RE = re.compile(r"<[^<>]*>")
+
+
+class RawJob(NamedTuple):
+    """
+    Satu lowongan hasil fetch (sebelum matching). Tuple: lebih kecil dari dict,
+    picklable untuk st.cache_data, dan tersimpan sebagai array di cache JSON.
+    """
+    source: str
+    title: str
+    title_lower: str
+    link: str
+    description_clean: str
+    published: str
+    content_digest: str  # blake2b title_lower + description_clean, key cache skor
+
+logger = logging.getLogger("dtpmxy")
+
+# Conditional GET cache: url -> {'etag', 'modified', 'jobs', 'error'}
+# Shared antar session, dan disimpan ke disk agar validator tetap terpakai
+# setelah restart / di worker process lain. Ditulis di luar repo (temp dir)
+# agar data job hasil scraping tidak ikut ter-commit.
+FEED_CACHE_DIR = os.path.join(tempfile.gettempdir(), "dtpmxy_rss")
+FEED_CACHE_FILE = os.path.join(FEED_CACHE_DIR, "rss_feed_cache.json")
+_FEED_VALIDATORS_LOCK = threading.Lock()
+
+
+def _load_feed_cache() -> Dict[str, Dict]:
+    try:
+        with open(FEED_CACHE_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data.values():
+            if not all(isinstance(job, list) for job in entry['jobs']):
+                raise TypeError("format cache lama (job sebagai dict)")
+            entry['jobs'] = [RawJob._make(job) for job in entry['jobs']]
+        return data
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return {}  # file tidak ada, rusak, atau format lama (dict / field kurang)
+
+
+def save_feed_cache():
+    """Tulis cache validator ke disk secara atomik (tmp file + os.replace).
+
+    Tiap pemanggil menulis ke tmp file unik (NamedTemporaryFile), jadi sesi
+    yang menyimpan bersamaan tidak saling menimpa file sementara.
+    """
+    with _FEED_VALIDATORS_LOCK:
+        snapshot = dict(_FEED_VALIDATORS)
+    tmp_path = None
+    try:
+        os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=FEED_CACHE_DIR, suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, FEED_CACHE_FILE)
+    except OSError:
+        logger.exception("Gagal menyimpan cache RSS ke %s", FEED_CACHE_FILE)
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+_FEED_VALIDATORS: Dict[str, Dict] = _load_feed_cache()
+
+
+def fetch_feed(url: str) -> tuple:
+    """
+    Download feed lewat shared HTTP session (keep-alive), lalu parse dengan
+    parse_feed_fast (ElementTree) atau feedparser sebagai fallback.
+    Kirim ETag/Last-Modified dari fetch sebelumnya; jika server balas 304,
+    job yang sudah dibersihkan dipakai ulang tanpa download, parse XML,
+    maupun clean HTML lagi.
+    Returns: (jobs, error) — error berisi pesan bozo feedparser atau None
+    """
+    with _FEED_VALIDATORS_LOCK:
+        cached = _FEED_VALIDATORS.get(url)
+    
+    headers = {'User-Agent': FEED_USER_AGENT}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('modified'):
+            headers['If-Modified-Since'] = cached['modified']
+    
+    response = get_http_session().get(
+        url, headers=headers, timeout=(FEED_CONNECT_TIMEOUT, FEED_TIMEOUT)
+    )
+    if response.status_code == 304 and cached:
+        return cached['jobs'], cached.get('error')
+    response.raise_for_status()
+    
+    source = urlparse(url).netloc
+    entries = parse_feed_fast(response.content)
+    error = None
+    if entries is None:
+        import feedparser  # lazy: hanya untuk feed yang tidak bisa di-parse jalur cepat
+        # Sanitize & resolve URI tidak diperlukan: HTML dibersihkan lagi oleh clean_html
+        feed = feedparser.parse(
+            response.content,
+            response_headers={
+                'content-location': url,
+                'content-type': response.headers.get('content-type', '')
+            },
+            sanitize_html=False,
+            resolve_relative_uris=False
+        )
+        entries = feed.entries
+        error = str(feed.get('bozo_exception', 'Unknown error')) if feed.get('bozo') else None
+    
+    jobs = [entry_to_job(entry, source) for entry in entries]
+    
+    etag = response.headers.get('ETag')
+    modified = response.headers.get('Last-Modified')
+    if etag or modified:
+        with _FEED_VALIDATORS_LOCK:
+            _FEED_VALIDATORS[url] = {'etag': etag, 'modified': modified, 'jobs': jobs, 'error': error}
+    return jobs, error
+
+
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+
+def _xml_text(element) -> str:
+    if element is None:
+        return ""
+    return "".join(element.itertext()).strip()
+
+
+def _rss_item_to_entry(item) -> Dict:
+    entry = {
+        "title": _xml_text(item.find("title")),
+        "link": _xml_text(item.find("link")),
+        "summary": _xml_text(item.find("description")),
+        "published": _xml_text(item.find("pubDate"))
+    }
+    content = _xml_text(item.find(_CONTENT_ENCODED))
+    if content:
+        entry["content"] = [{"value": content}]
+    return {k: v for k, v in entry.items() if v}
+
+
+def _atom_entry_to_entry(item) -> Dict:
+    link = ""
+    for link_el in item.iterfind(f"{_ATOM_NS}link"):
+        if link_el.get("rel", "alternate") == "alternate":
+            link = link_el.get("href", "")
+            break
+    entry = {
+        "title": _xml_text(item.find(f"{_ATOM_NS}title")),
+        "link": link,
+        "summary": _xml_text(item.find(f"{_ATOM_NS}summary")),
+        "published": _xml_text(item.find(f"{_ATOM_NS}published"))
+                     or _xml_text(item.find(f"{_ATOM_NS}updated"))
+    }
+    content = _xml_text(item.find(f"{_ATOM_NS}content"))
+    if content:
+        entry["content"] = [{"value": content}]
+    return {k: v for k, v in entry.items() if v}
+
+
+# Tag root -> (tag item, konverter item ke entry dict)
+_FEED_FORMATS = {
+    "rss": ("item", _rss_item_to_entry),
+    f"{_ATOM_NS}feed": (f"{_ATOM_NS}entry", _atom_entry_to_entry)
+}
+
+
+def parse_feed_fast(body: bytes) -> Optional[List[Dict]]:
+    """
+    Parse RSS 2.0 / Atom dengan ElementTree menjadi entry dict berkey sama
+    seperti feedparser (title, link, summary, content, published).
+    Streaming via iterparse: tiap item di-clear setelah dikonversi, jadi
+    hanya satu item yang hidup sebagai element tree pada satu waktu.
+    Returns None jika defusedxml tidak ada, XML tidak valid, format lain
+    (mis. RSS 1.0/RDF), atau tanpa item -> caller fallback ke feedparser.
+    """
+    if not DEFUSEDXML_AVAILABLE:
+        return None
+    
+    entries = []
+    item_tag = to_entry = None
+    try:
+        for event, elem in safe_xml_iterparse(io.BytesIO(body), events=("start", "end")):
+            if item_tag is None:
+                # Event pertama = root element
+                if elem.tag not in _FEED_FORMATS:
+                    return None
+                item_tag, to_entry = _FEED_FORMATS[elem.tag]
+            elif event == "end" and elem.tag == item_tag:
+                entries.append(to_entry(elem))
+                elem.clear()
+    except Exception:  # ParseError, DefusedXmlException, dll
+        return None
+    
+    return entries or None
+
+
+def entry_to_job(entry, source: str) -> RawJob:
+    """
+    Ubah satu entry (dict hasil parse_feed_fast atau FeedParserDict) menjadi RawJob.
+    Akses via .get() saja, tanpa hasattr/getattr.
+    HTML dibersihkan di sini (saat fetch), bukan saat matching, dan HTML
+    mentah tidak disimpan agar hasil cache lebih kecil.
+    """
+    # Try multiple fields for description
+    description = entry.get("summary") or entry.get("description") or ""
+    if not description:
+        content = entry.get("content")
+        description = content[0].get("value", "") if content else ""
+    
+    title = entry.get("title", "No Title")
+    title_lower = title.lower()
+    description_clean = clean_html(description[:MAX_DESCRIPTION_HTML_CHARS])
+    return RawJob(
+        source=source,
+        title=title,
+        title_lower=title_lower,
+        link=entry.get("link", "#"),
+        description_clean=description_clean,
+        published=entry.get("published", "Unknown date"),
+        content_digest=hashlib.blake2b(
+            f"{title_lower}\x00{description_clean}".encode("utf-8", "surrogatepass"), digest_size=16
+        ).hexdigest()
+    )
+
+
+# Cache hasil clean_html, key = digest HTML (bukan string HTML-nya) agar memori terbatas
+CLEAN_CACHE_MAX_ENTRIES = 4096
+_CLEAN_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_CLEAN_CACHE_LOCK = threading.Lock()
+
+
+# Jangan pakai numba @njit di sini: string tidak didukung di nopython mode, jatuh ke
+# object mode dan malah lebih lambat. Jalur cepatnya selectolax / cache digest.
 def clean_html(raw_html: str) -> str:
-    """Clean HTML and extract plain text"""
+    """
+    Clean HTML and extract plain text.
+    Di-memoize per digest konten: feed yang di-download ulang (200, bukan 304)
+    biasanya hanya berisi sedikit entry baru, sisanya tidak perlu di-parse lagi.
+    """
     if not raw_html:
         return ""
+    key = hashlib.blake2b(raw_html.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _CLEAN_CACHE_LOCK:
+        cached = _CLEAN_CACHE.get(key)
+        if cached is not None:
+            _CLEAN_CACHE.move_to_end(key)
+            return cached
+    
+    cleaned = _clean_html_uncached(raw_html)
+    with _CLEAN_CACHE_LOCK:
+        _CLEAN_CACHE[key] = cleaned
+        while len(_CLEAN_CACHE) > CLEAN_CACHE_MAX_ENTRIES:
+            _CLEAN_CACHE.popitem(last=False)
+    return cleaned
+
+
+def _clean_html_uncached(raw_html: str) -> str:
     try:
-        soup = BeautifulSoup(raw_html, "html.parser")
-        cleaned = soup.get_text(separator=" ", strip=True)
-        cleaned = re.sub(r"\s+", " ", cleaned)
-        return cleaned.lower()
+        if "<" not in raw_html:
+            # Teks polos (banyak deskripsi RSS): cukup decode entity, tanpa parser
+            cleaned = html.unescape(raw_html)
+        elif SELECTOLAX_AVAILABLE:
+            cleaned = HTMLParser(raw_html).text(separator=" ", strip=True)
+        else:
+            # Tanpa selectolax: strip tag via regex; BeautifulSoup hanya untuk HTML
+            # rusak (sisa '<' yang tidak tertutup)
+            cleaned = _TAG_RE.sub(" ", raw_html)
+            if "<" in cleaned:
+                from bs4 import BeautifulSoup  # lazy: fallback terakhir
+                cleaned = BeautifulSoup(raw_html, "html.parser").get_text(separator=" ", strip=True)
+            else:
+                cleaned = html.unescape(cleaned)
+        return _WS_RE.sub(" ", cleaned).strip().lower()
     except Exception:
         return str(raw_html).lower()
 
 
-def match_keywords(text: str, keywords: List[str]) -> List[str]:
-    """Match keywords in text and return found matches"""
-    if not text or not keywords:
-        return []
+DEDUP_SIGNATURE_CHARS = 200  # awal deskripsi (sudah bersih) yang ikut signature lintas source
+
+
+def dedupe_jobs(jobs: List[RawJob]) -> List[RawJob]:
+    """
+    Buang lowongan duplikat (feed sering me-republish posting yang sama).
+    Key 1: link tanpa query string/fragment (UTM dll); key 2: (judul, source)
+    untuk posting sindikasi dengan URL berbeda; key 3: signature konten
+    (judul + awal deskripsi) untuk listing yang sama di source berbeda.
+    Urutan asli dipertahankan.
+    """
+    seen_links = set()
+    seen_titles = set()
+    seen_signatures = set()
+    unique = []
+    for job in jobs:
+        parts = urlsplit(job.link)
+        # Entry tanpa link ("#") tidak boleh saling dianggap duplikat
+        link_key = (parts.netloc.lower(), parts.path.rstrip("/")) if parts.netloc else None
+        title = job.title_lower.strip()
+        title_key = (title, job.source)
+        # Judul saja tidak cukup lintas source ("senior python developer" dari perusahaan
+        # berbeda); deskripsi listing sindikasi identik, jadi ikut jadi bagian signature
+        signature = hashlib.blake2b(
+            f"{_WS_RE.sub(' ', title)}|{job.description_clean[:DEDUP_SIGNATURE_CHARS]}".encode(
+                "utf-8", "surrogatepass"
+            ),
+            digest_size=8
+        ).digest()
+        if link_key in seen_links or title_key in seen_titles or signature in seen_signatures:
+            continue
+        if link_key is not None:
+            seen_links.add(link_key)
+        seen_titles.add(title_key)
+        seen_signatures.add(signature)
+        unique.append(job)
+    return unique
+
+
+# Near-duplicate: posting sama yang di-cross-post dengan kata-kata sedikit berbeda
+NEAR_DUP_THRESHOLD = 0.8  # Jaccard minimum shingle kata
+NEAR_DUP_SHINGLE_SIZE = 5  # jumlah kata per shingle
+NEAR_DUP_TEXT_CHARS = 300  # judul + awal deskripsi (sama dengan preview)
+
+
+def _shingles(text: str, k: int = NEAR_DUP_SHINGLE_SIZE) -> frozenset:
+    """Word k-shingles; teks yang lebih pendek dari k kata jadi satu shingle"""
+    words = text.split()
+    if len(words) <= k:
+        return frozenset([tuple(words)])
+    return frozenset(tuple(words[i:i + k]) for i in range(len(words) - k + 1))
+
+
+class _NearDuplicateIndex:
+    """
+    Inverted index shingle -> dokumen yang sudah diterima. Satu query per job
+    hanya menyentuh dokumen yang berbagi shingle, bukan perbandingan O(N²).
+    """
     
-    found = []
-    text_lower = text.lower()
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD):
+        self.threshold = threshold
+        self._postings: Dict[tuple, List[int]] = {}
+        self._sizes: List[int] = []
     
+    def add_if_new(self, shingles: frozenset) -> bool:
+        """False jika mirip (Jaccard >= threshold) dengan dokumen yang sudah ada"""
+        overlap = Counter()
+        for shingle in shingles:
+            overlap.update(self._postings.get(shingle, ()))
+        for doc_id, shared in overlap.items():
+            if shared / (len(shingles) + self._sizes[doc_id] - shared) >= self.threshold:
+                return False
+        doc_id = len(self._sizes)
+        self._sizes.append(len(shingles))
+        for shingle in shingles:
+            self._postings.setdefault(shingle, []).append(doc_id)
+        return True
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class _AhoCorasickMatcher:
+    """
+    Multi-keyword matcher dengan interface findall() seperti re.Pattern,
+    plus iter_matches() yang menyertakan offset.
+    Semantik word-boundary sama dengan \\b regex: batas valid jika karakter
+    di luar & di dalam tepi keyword berbeda jenis (word vs non-word).
+    """
+    
+    def __init__(self, keywords: tuple):
+        self._automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            self._automaton.add_word(keyword, keyword)
+        self._automaton.make_automaton()
+    
+    def iter_matches(self, text: str):
+        """Yield (offset_awal, keyword) untuk tiap match whole-word"""
+        last = len(text) - 1
+        for end, keyword in self._automaton.iter(text):
+            start = end - len(keyword) + 1
+            before = start > 0 and _is_word_char(text[start - 1])
+            after = end < last and _is_word_char(text[end + 1])
+            if (before != _is_word_char(keyword[0])) and (after != _is_word_char(keyword[-1])):
+                yield start, keyword
+    
+    def findall(self, text: str) -> List[str]:
+        return [keyword for _, keyword in self.iter_matches(text)]
+
+
+class _RegexKeywordMatcher:
+    """
+    Fallback tanpa pyahocorasick, interface sama dengan _AhoCorasickMatcher.
+    Satu regex alternation (terpanjang dulu) dalam lookahead memberi keyword
+    terpanjang di tiap offset; keyword lain yang cocok di offset yang sama pasti
+    prefix-nya, jadi cukup dicek word boundary di ujungnya ("data science" dan
+    "data" sama-sama dilaporkan, seperti Aho-Corasick).
+    """
+    
+    def __init__(self, keywords: tuple):
+        self._pattern = re.compile(r"(?=\b(" + "|".join(re.escape(k) for k in keywords) + r")\b)")
+        keyword_set = set(keywords)
+        self._prefixes = {
+            k: [k[:i] for i in range(len(k) - 1, 0, -1) if k[:i] in keyword_set]
+            for k in keywords
+        }
+    
+    def iter_matches(self, text: str):
+        """Yield (offset_awal, keyword) untuk tiap match whole-word"""
+        size = len(text)
+        for m in self._pattern.finditer(text):
+            start, longest = m.start(), m.group(1)
+            yield start, longest
+            for prefix in self._prefixes[longest]:
+                end = start + len(prefix)
+                # \b setelah prefix: prefix[-1] dan text[end] beda jenis (word vs non-word)
+                if _is_word_char(prefix[-1]) != (end < size and _is_word_char(text[end])):
+                    yield start, prefix
+    
+    def findall(self, text: str) -> List[str]:
+        return [keyword for _, keyword in self.iter_matches(text)]
+
+
+class KeywordPattern(NamedTuple):
+    """Matcher gabungan + peta keyword lowercase -> ejaan asli dari caller"""
+    matcher: object
+    originals: Dict[str, str]
+
+
+def compile_keyword_pattern(keywords: Iterable[str]) -> Optional[KeywordPattern]:
+    """
+    Gabungkan semua keyword (lowercase) menjadi satu matcher whole-word, jadi
+    teks cukup di-scan sekali, bukan sekali per keyword.
+    Pakai automaton Aho-Corasick jika pyahocorasick terinstall; jika tidak,
+    _RegexKeywordMatcher. Keduanya melaporkan semua keyword yang tumpang tindih
+    ("data science", "data" & "science"), jadi skor tidak bergantung backend.
+    Returns: KeywordPattern untuk match_keywords, atau None jika tanpa keyword.
+    """
+    originals = {}
     for keyword in keywords:
-        keyword_clean = keyword.lower().strip()
-        if not keyword_clean:
-            continue
-            
-        # Escape special strings and use word boundaries
-        # Use regex to find whole words only
-        try:
-            pattern = r'\b' + re.escape(keyword_clean) + r'\b'
-            if re.search(pattern, text_lower):
-                found.append(keyword)
-        except re.error:
-            # Fallback for complex chars
-            if keyword_clean in text_lower:
-                found.append(keyword)
+        if keyword and keyword.strip():
+            originals.setdefault(keyword.lower().strip(), keyword)
+    if not originals:
+        return None
+    return KeywordPattern(_keyword_matcher(normalize_keywords(originals)), originals)
+
+
+def normalize_keywords(keywords: Iterable[str]) -> tuple:
+    """Keyword lowercase unik, urutan deterministik (terpanjang dulu) -> key cache stabil"""
+    cleaned = {k.lower().strip() for k in keywords if k and k.strip()}
+    return tuple(sorted(cleaned, key=lambda k: (-len(k), k)))
+
+
+def _keyword_matcher(ordered: tuple):
+    if AHOCORASICK_AVAILABLE:
+        return _build_automaton(ordered)
+    return _compile_alternation(ordered)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_automaton(keywords: tuple) -> _AhoCorasickMatcher:
+    return _AhoCorasickMatcher(keywords)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_alternation(keywords: tuple) -> _RegexKeywordMatcher:
+    return _RegexKeywordMatcher(keywords)
+
+
+# Jangan pakai numba @njit di sini (alasan sama dengan clean_html); jalur cepatnya
+# automaton Aho-Corasick (C extension) / regex alternation stdlib.
+def match_keywords(text: str, pattern: Optional[KeywordPattern]) -> set:
+    """
+    Keyword dari compile_keyword_pattern yang muncul di text (sudah lowercase),
+    dengan ejaan asli seperti yang diberikan caller ("Python", bukan "python")
+    """
+    if not text or pattern is None:
+        return set()
+    return {pattern.originals[k] for k in pattern.matcher.findall(text)}
+
+
+# Pemisah zona title|description: non-word char (batas \b tetap sama) & tidak ada di keyword
+_ZONE_SEPARATOR = "\x00"
+
+
+def match_keywords_zoned(title: str, description: str, pattern) -> tuple:
+    """
+    Satu scan atas title + pemisah + description, bukan dua scan terpisah;
+    zona tiap match ditentukan dari offset-nya.
+    Returns: (set keyword di title, set keyword di description)
+    """
+    in_title, in_desc = set(), set()
+    if pattern is None or not (title or description):
+        return in_title, in_desc
+    text = f"{title}{_ZONE_SEPARATOR}{description}"
+    boundary = len(title)
+    for start, keyword in pattern.iter_matches(text):
+        (in_title if start < boundary else in_desc).add(keyword)
+    return in_title, in_desc
+
+
+# Bobot skor per keyword yang cocok, per kategori
+MATCH_WEIGHTS = {"title": 3, "description": 1, "skill": 2, "occupation": 4}
+
+
+# Cache skor per (digest job, keyword): key tidak menyimpan teks deskripsi (s.d. 20 KB/job)
+SCORE_CACHE_MAX_ENTRIES = 2048
+_SCORE_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_SCORE_CACHE_LOCK = threading.Lock()
+
+
+def _score_job(
+    job: RawJob,
+    keyword_key: tuple,
+    skill_keys: frozenset,
+    occupation_keys: frozenset
+) -> tuple:
+    """
+    Skor satu job terhadap satu set keyword, di-memoize per job.content_digest.
+    Job yang sama dengan profil yang sama tidak di-scan ulang walau cache
+    process_jobs_with_profile miss (mis. max_results/mode berbeda).
+    Returns: (total_score, skill_keys_cocok, occupation_keys_cocok, jumlah_keyword_cocok)
+    """
+    key = (job.content_digest, keyword_key, skill_keys, occupation_keys)
+    with _SCORE_CACHE_LOCK:
+        cached = _SCORE_CACHE.get(key)
+        if cached is not None:
+            _SCORE_CACHE.move_to_end(key)
+            return cached
     
-    return list(set(found))  # Remove duplicates
+    result = _score_job_uncached(
+        job.title_lower, job.description_clean, keyword_key, skill_keys, occupation_keys
+    )
+    with _SCORE_CACHE_LOCK:
+        _SCORE_CACHE[key] = result
+        while len(_SCORE_CACHE) > SCORE_CACHE_MAX_ENTRIES:
+            _SCORE_CACHE.popitem(last=False)
+    return result
+
+
+def _score_job_uncached(
+    title_lower: str,
+    description_clean: str,
+    keyword_key: tuple,
+    skill_keys: frozenset,
+    occupation_keys: frozenset
+) -> tuple:
+    matcher = _keyword_matcher(keyword_key) if keyword_key else None
+    
+    # Match in both title and description
+    matched_in_title, matched_in_desc = match_keywords_zoned(title_lower, description_clean, matcher)
+    matched_any = matched_in_title | matched_in_desc
+    
+    # Separate skill and occupation matches
+    matched_skills = tuple(sorted(skill_keys & matched_any))
+    matched_occu = tuple(sorted(occupation_keys & matched_any))
+    
+    # Calculate score with weighting
+    total_score = (
+        len(matched_in_title) * MATCH_WEIGHTS["title"]
+        + len(matched_in_desc) * MATCH_WEIGHTS["description"]
+        + len(matched_skills) * MATCH_WEIGHTS["skill"]
+        + len(matched_occu) * MATCH_WEIGHTS["occupation"]
+    )
+    return total_score, matched_skills, matched_occu, len(matched_in_title) + len(matched_in_desc)
 
 
 # =====================================================================================
 # RSS FETCHING (SILENT MODE)
 # =====================================================================================
 
-def fetch_all_rss_silent(feeds: List[str] = RSS_FEEDS) -> tuple:
-    """Fetch all jobs from RSS feeds silently (no status messages)"""
-    all_jobs = []
-    debug_info = {
+@st.cache_data(ttl=FEED_CACHE_TTL, show_spinner=False)
+def fetch_feed_cached(url: str, refresh_nonce: int = 0) -> tuple:
+    """
+    fetch_feed dengan TTL: session lain dalam 15 menit tidak menyentuh jaringan sama sekali.
+    refresh_nonce hanya jadi bagian key cache: tombol Refresh satu session memakai
+    nonce baru tanpa membuang cache session lain.
+    """
+    return fetch_feed(url)
+
+
+def _fetch_one_feed(url: str, refresh_nonce: int = 0) -> tuple:
+    """Fetch & parse satu feed. Returns: (jobs, feed_info); tidak pernah raise"""
+    feed_info = {
+        'url': url,
+        'status': 'pending',
+        'entries': 0,
+        'error': None
+    }
+    
+    try:
+        jobs, error = fetch_feed_cached(url, refresh_nonce)
+    except Exception as e:
+        feed_info['status'] = 'failed'
+        feed_info['error'] = str(e)
+        return [], feed_info
+    
+    # Check for errors
+    if error:
+        feed_info['error'] = error
+        feed_info['status'] = 'error'
+    else:
+        feed_info['status'] = 'success'
+    
+    # Get entries
+    feed_info['entries'] = len(jobs)
+    if not jobs:
+        feed_info['status'] = 'empty'
+    
+    return jobs, feed_info
+
+
+def _new_debug_info(feeds: List[str]) -> Dict:
+    return {
         'total_feeds': len(feeds),
         'successful_feeds': 0,
         'failed_feeds': 0,
         'total_entries': 0,
         'feed_details': []
     }
+
+
+def _record_feed(debug_info: Dict, feed_info: Dict):
+    """Akumulasi statistik satu feed ke debug_info"""
+    if feed_info['status'] == 'failed':
+        debug_info['failed_feeds'] += 1
+    elif feed_info['entries'] > 0:
+        debug_info['successful_feeds'] += 1
+    debug_info['total_entries'] += feed_info['entries']
+    debug_info['feed_details'].append(feed_info)
+
+
+def _fetch_feeds_parallel(feeds: List[str], refresh_nonce: int = 0) -> List[tuple]:
+    """
+    Fetch semua feed paralel (I/O-bound, GIL dilepas saat menunggu socket),
+    jadi total waktu ≈ feed paling lambat, bukan jumlah semuanya.
+    Returns: list (jobs, feed_info) dengan urutan sama seperti feeds.
+    """
+    if not feeds:
+        return []
     
-    for url in feeds:
-        feed_info = {
-            'url': url,
-            'status': 'pending',
-            'entries': 0,
-            'error': None
-        }
-        
-        try:
-            # Parse feed (silent)
-            feed = feedparser.parse(url)
-            
-            # Check for errors
-            if hasattr(feed, 'bozo') and feed.bozo:
-                feed_info['error'] = str(getattr(feed, 'bozo_exception', 'Unknown error'))
-                feed_info['status'] = 'error'
-            else:
-                feed_info['status'] = 'success'
-            
-            # Get entries
-            entries_count = len(feed.entries)
-            feed_info['entries'] = entries_count
-            debug_info['total_entries'] += entries_count
-            
-            if entries_count == 0:
-                feed_info['status'] = 'empty'
-            else:
-                debug_info['successful_feeds'] += 1
-            
-            # Extract jobs
-            for entry in feed.entries:
-                description = ""
-                
-                # Try multiple fields for description
-                if hasattr(entry, "summary"):
-                    description = entry.summary
-                elif hasattr(entry, "description"):
-                    description = entry.description
-                elif hasattr(entry, "content") and len(entry.content) > 0:
-                    description = entry.content[0].value
-                
-                job = {
-                    "source": url.split("/")[2],
-                    "title": getattr(entry, "title", "No Title"),
-                    "link": getattr(entry, "link", "#"),
-                    "description_html": description,
-                    "published": getattr(entry, "published", "Unknown date")
-                }
-                
-                all_jobs.append(job)
-        
-        except Exception as e:
-            feed_info['status'] = 'failed'
-            feed_info['error'] = str(e)
-            debug_info['failed_feeds'] += 1
-        
-        debug_info['feed_details'].append(feed_info)
-        time.sleep(0.3)  # Small delay between requests
+    # executor.map menjaga urutan hasil sesuai urutan feeds; worker dapat
+    # script context agar get_http_session (cache_resource) bisa dipanggil.
+    # Worker tidak memanggil st.* lain: pesan UI dikeluarkan setelah join.
+    with ThreadPoolExecutor(
+        max_workers=len(feeds),
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    ) as executor:
+        results = list(executor.map(functools.partial(_fetch_one_feed, refresh_nonce=refresh_nonce), feeds))
+    
+    save_feed_cache()
+    return results
+
+
+def fetch_all_rss_silent(feeds: List[str] = RSS_FEEDS, refresh_nonce: int = 0) -> tuple:
+    """Fetch all jobs from RSS feeds silently (no status messages)"""
+    all_jobs = []
+    debug_info = _new_debug_info(feeds)
+    
+    for jobs, feed_info in _fetch_feeds_parallel(feeds, refresh_nonce):
+        all_jobs.extend(jobs)
+        _record_feed(debug_info, feed_info)
     
     return all_jobs, debug_info
 
@@ -142,80 +747,24 @@ def fetch_all_rss_silent(feeds: List[str] = RSS_FEEDS) -> tuple:
 # RSS FETCHING WITH DEBUG (VERBOSE MODE)
 # =====================================================================================
 
-def fetch_all_rss_debug(feeds: List[str] = RSS_FEEDS) -> tuple:
+def fetch_all_rss_debug(feeds: List[str] = RSS_FEEDS, refresh_nonce: int = 0) -> tuple:
     """Fetch all jobs from RSS feeds with detailed debugging"""
     all_jobs = []
-    debug_info = {
-        'total_feeds': len(feeds),
-        'successful_feeds': 0,
-        'failed_feeds': 0,
-        'total_entries': 0,
-        'feed_details': []
-    }
+    debug_info = _new_debug_info(feeds)
     
-    for idx, url in enumerate(feeds, 1):
-        feed_info = {
-            'url': url,
-            'status': 'pending',
-            'entries': 0,
-            'error': None
-        }
-        
-        try:
-            st.info(f"🔄 Fetching feed {idx}/{len(feeds)}: {url}")
-            
-            # Parse feed
-            feed = feedparser.parse(url)
-            
-            # Check for errors
-            if hasattr(feed, 'bozo') and feed.bozo:
-                feed_info['error'] = str(getattr(feed, 'bozo_exception', 'Unknown error'))
-                feed_info['status'] = 'error'
-            else:
-                feed_info['status'] = 'success'
-            
-            # Get entries
-            entries_count = len(feed.entries)
-            feed_info['entries'] = entries_count
-            debug_info['total_entries'] += entries_count
-            
-            if entries_count == 0:
-                st.warning(f"⚠️ {url}: No entries found")
-                feed_info['status'] = 'empty'
-            else:
-                st.success(f"✅ {url}: Found {entries_count} jobs")
-                debug_info['successful_feeds'] += 1
-            
-            # Extract jobs
-            for entry in feed.entries:
-                description = ""
-                
-                # Try multiple fields for description
-                if hasattr(entry, "summary"):
-                    description = entry.summary
-                elif hasattr(entry, "description"):
-                    description = entry.description
-                elif hasattr(entry, "content") and len(entry.content) > 0:
-                    description = entry.content[0].value
-                
-                job = {
-                    "source": url.split("/")[2],
-                    "title": getattr(entry, "title", "No Title"),
-                    "link": getattr(entry, "link", "#"),
-                    "description_html": description,
-                    "published": getattr(entry, "published", "Unknown date")
-                }
-                
-                all_jobs.append(job)
-        
-        except Exception as e:
-            st.error(f"❌ Error fetching {url}: {str(e)}")
-            feed_info['status'] = 'failed'
-            feed_info['error'] = str(e)
-            debug_info['failed_feeds'] += 1
+    st.info(f"🔄 Fetching {len(feeds)} feeds in parallel...")
+    
+    for jobs, feed_info in _fetch_feeds_parallel(feeds, refresh_nonce):
+        url = feed_info['url']
+        if feed_info['status'] == 'failed':
+            st.error(f"❌ Error fetching {url}: {feed_info['error']}")
+        elif feed_info['entries'] == 0:
+            st.warning(f"⚠️ {url}: No entries found")
+        else:
+            st.success(f"✅ {url}: Found {feed_info['entries']} jobs")
         
-        debug_info['feed_details'].append(feed_info)
-        time.sleep(0.5)  # Small delay between requests
+        all_jobs.extend(jobs)
+        _record_feed(debug_info, feed_info)
     
     return all_jobs, debug_info
 
@@ -224,6 +773,33 @@ def fetch_all_rss_debug(feeds: List[str] = RSS_FEEDS) -> tuple:
 # JOB MATCHING ENGINE
 # =====================================================================================
 
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=4)
+def _embed_job_texts(job_texts: tuple) -> np.ndarray:
+    """Embedding seluruh korpus job sekali per refresh (float16: separuh memori)"""
+    model = load_embedding_model()
+    return model.encode(
+        list(job_texts),
+        batch_size=32,
+        normalize_embeddings=True,
+        convert_to_numpy=True
+    ).astype(np.float16)
+
+
+def semantic_job_scores(raw_jobs: List[RawJob], profile_text: str) -> Optional[np.ndarray]:
+    """Cosine similarity profil vs setiap job (satu matmul); None jika model gagal"""
+    job_texts = tuple(f"{job.title} {job.description_clean[:512]}" for job in raw_jobs)
+    try:
+        embs = _embed_job_texts(job_texts)
+        user_vec = load_query_encoder().encode(
+            profile_text, normalize_embeddings=True, convert_to_numpy=True
+        )
+    except Exception:
+        logger.exception("Semantic job ranking gagal, pakai skor keyword saja")
+        return None
+    # Hitung di float32: matmul float16 di NumPy tidak memakai BLAS
+    return embs.astype(np.float32) @ user_vec.astype(np.float32)
+
+
 @st.cache_data(ttl=3600, show_spinner=False)
 def process_jobs_with_profile(
     user_skills: List[str],
@@ -231,18 +807,20 @@ def process_jobs_with_profile(
     unit_kompetensi: str = "",
     max_results: int = 50,
     show_debug: bool = False,
-    silent_mode: bool = True
+    silent_mode: bool = True,
+    refresh_nonce: int = 0
 ) -> tuple:
     """
     Process jobs and match with user profile
+    refresh_nonce: diganti oleh tombol Refresh agar cache (milik session itu saja) miss
     Returns: (matched_jobs, debug_info)
     """
     
     # Fetch jobs from RSS feeds (silent or verbose)
     if silent_mode:
-        raw_jobs, fetch_debug = fetch_all_rss_silent()
+        raw_jobs, fetch_debug = fetch_all_rss_silent(refresh_nonce=refresh_nonce)
     else:
-        raw_jobs, fetch_debug = fetch_all_rss_debug()
+        raw_jobs, fetch_debug = fetch_all_rss_debug(refresh_nonce=refresh_nonce)
     
     # Show fetch statistics (only if debug mode)
     if show_debug and not silent_mode:
@@ -259,88 +837,111 @@ def process_jobs_with_profile(
             st.warning("⚠️ Tidak ada job yang berhasil di-fetch dari RSS feeds")
         return [], fetch_debug
     
-    # Prepare keywords for matching
-    all_keywords = []
-    all_keywords.extend([skill.lower().strip() for skill in user_skills if skill])
-    all_keywords.extend([occ.lower().strip() for occ in user_occupations if occ])
+    # Dedup sebelum matching loop
+    fetched_count = len(raw_jobs)
+    raw_jobs = dedupe_jobs(raw_jobs)
+    fetch_debug['duplicates_removed'] = fetched_count - len(raw_jobs)
     
-    if unit_kompetensi:
-        unit_keywords = [k.strip().lower() for k in re.split(r'[,;]+', unit_kompetensi) if k.strip()]
-        all_keywords.extend(unit_keywords)
+    # Prepare keywords for matching (lowercase key -> ejaan asli untuk ditampilkan)
+    skills_by_key = {s.lower().strip(): s for s in user_skills if s and s.strip()}
+    occupations_by_key = {o.lower().strip(): o for o in user_occupations if o and o.strip()}
     
-    # Remove duplicates and empty strings
-    all_keywords = [k for k in list(set(all_keywords)) if k]
+    # Set: duplikat & string kosong otomatis tersaring
+    all_keywords = skills_by_key.keys() | occupations_by_key.keys()
+    if unit_kompetensi:
+        all_keywords.update(k.strip().lower() for k in re.split(r'[,;]+', unit_kompetensi) if k.strip())
     
     # Show search info (only if debug mode)
     if show_debug and not silent_mode:
-        st.info(f"🔍 Searching with {len(all_keywords)} keywords: {', '.join(all_keywords[:10])}")
+        st.info(f"🔍 Searching with {len(all_keywords)} keywords: {', '.join(sorted(all_keywords)[:10])}")
     
-    results = []
+    # Satu matcher untuk semua keyword; skill/okupasi diturunkan dari hasilnya
+    keyword_key = normalize_keywords(all_keywords)
+    skill_keys = frozenset(skills_by_key)
+    occupation_keys = frozenset(occupations_by_key)
+    
+    # Kandidat disimpan sebagai tuple ringan; dict hasil hanya dibangun untuk top-N
+    candidates = []
     processed_count = 0
     matched_count = 0
+    near_duplicate_count = 0
     
     # Create progress bar only if not silent
+    total_jobs = len(raw_jobs)
     if not silent_mode:
         progress_bar = st.progress(0)
         status_text = st.empty()
+        # Setiap update widget = satu pesan websocket; cukup ~PROGRESS_UPDATES kali
+        update_every = max(1, total_jobs // PROGRESS_UPDATES)
     
     for idx, job in enumerate(raw_jobs):
         processed_count += 1
         
-        # Update progress (only if not silent)
-        if not silent_mode:
-            progress = (idx + 1) / len(raw_jobs)
-            progress_bar.progress(progress)
-            status_text.text(f"Processing job {idx + 1}/{len(raw_jobs)}: {job['title'][:50]}...")
-        
-        # Clean description
-        cleaned_desc = clean_html(job["description_html"])
-        title_lower = job["title"].lower()
+        # Update progress (only if not silent), di-throttle
+        if not silent_mode and idx % update_every == 0:
+            progress_bar.progress((idx + 1) / total_jobs)
+            status_text.text(f"Processing job {idx + 1}/{total_jobs}: {job.title[:50]}...")
         
-        # Match in both title and description
-        matched_in_title = match_keywords(title_lower, all_keywords)
-        matched_in_desc = match_keywords(cleaned_desc, all_keywords)
-        
-        # Separate skill and occupation matches
-        matched_skills = match_keywords(
-            f"{title_lower} {cleaned_desc}", 
-            user_skills
-        )
-        matched_occu = match_keywords(
-            f"{title_lower} {cleaned_desc}", 
-            user_occupations
+        total_score, skill_hits, occu_hits, keywords_count = _score_job(
+            job, keyword_key, skill_keys, occupation_keys
         )
         
-        # Calculate score with weighting
-        title_score = len(matched_in_title) * 3
-        desc_score = len(matched_in_desc) * 1
-        skill_score = len(matched_skills) * 2
-        occu_score = len(matched_occu) * 4
-        
-        total_score = title_score + desc_score + skill_score + occu_score
-        
         # Only include jobs with at least 1 match
         if total_score > 0:
             matched_count += 1
-            results.append({
-                "source": job["source"],
-                "title": job["title"],
-                "link": job["link"],
-                "published": job.get("published", "Unknown"),
-                "description_preview": cleaned_desc[:300] + "..." if len(cleaned_desc) > 300 else cleaned_desc,
-                "matched_skills": matched_skills,
-                "matched_occupations": matched_occu,
-                "match_score": total_score,
-                "matched_keywords_count": len(matched_in_title) + len(matched_in_desc)
-            })
+            candidates.append((
+                total_score,
+                job,
+                [skills_by_key[k] for k in skill_hits],
+                [occupations_by_key[k] for k in occu_hits],
+                keywords_count,
+                idx
+            ))
     
     # Clear progress indicators (only if not silent)
     if not silent_mode:
         progress_bar.empty()
         status_text.empty()
     
-    # Sort by match score
-    results = sorted(results, key=lambda x: x["match_score"], reverse=True)
+    # Opsional: rerank kandidat dengan gabungan skor semantic & skor keyword (dinormalisasi)
+    rank_key = itemgetter(0)
+    if ENABLE_SEMANTIC_JOB_RANKING and candidates:
+        profile_text = " ".join([*skills_by_key.values(), *occupations_by_key.values()])
+        semantic = semantic_job_scores(raw_jobs, profile_text)
+        if semantic is not None:
+            max_score = max(c[0] for c in candidates)
+            weight = SEMANTIC_JOB_RANKING_WEIGHT
+            rank_key = lambda c: weight * semantic[c[5]] + (1 - weight) * c[0] / max_score
+    
+    # Top-N tanpa near-duplicate: heap diambil sesuai ranking (O(N + K log N)), job yang
+    # mirip dengan job berskor lebih tinggi dilewati. Tie-break idx = stabil seperti sorted()
+    heap = [(-rank_key(c), c[5], c) for c in candidates]
+    heapq.heapify(heap)
+    near_dups = _NearDuplicateIndex()
+    selected = []
+    while heap and len(selected) < max_results:
+        candidate = heapq.heappop(heap)[2]
+        job = candidate[1]
+        if near_dups.add_if_new(_shingles(f"{job.title_lower} {job.description_clean[:NEAR_DUP_TEXT_CHARS]}")):
+            selected.append(candidate)
+        else:
+            near_duplicate_count += 1
+    fetch_debug['near_duplicates_removed'] = near_duplicate_count
+    
+    results = []
+    for total_score, job, matched_skills, matched_occu, keywords_count, _ in selected:
+        cleaned_desc = job.description_clean
+        results.append({
+            "source": job.source,
+            "title": job.title,
+            "link": job.link,
+            "published": job.published,
+            "description_preview": cleaned_desc[:300] + "..." if len(cleaned_desc) > 300 else cleaned_desc,
+            "matched_skills": matched_skills,
+            "matched_occupations": matched_occu,
+            "match_score": total_score,
+            "matched_keywords_count": keywords_count
+        })
     
     # Update debug info
     fetch_debug['processed_jobs'] = processed_count
@@ -353,109 +954,40 @@ def process_jobs_with_profile(
         **✅ Processing Complete:**
         - Processed: {processed_count} jobs
         - Matched: {matched_count} jobs ({fetch_debug['match_rate']})
-        - Returning top: {min(len(results), max_results)} results
+        - Returning top: {len(results)} results
         """)
     
-    return results[:max_results], fetch_debug
+    return results, fetch_debug
 
 
 # =====================================================================================
 # STREAMLIT UI COMPONENT
 # =====================================================================================
 
-def render_rss_job_recommendations(
-    user_skills: List[str],
-    okupasi_nama: str,
-    unit_kompetensi: str = "",
-    okupasi_info: Dict = None,
-    silent_mode: bool = True
-):
-    """Render RSS job recommendations in Streamlit"""
-    
-    st.markdown("### 🌐 Remote Job Recommendations")
-    st.caption("Lowongan kerja remote dari berbagai platform internasional")
-    
-    # Debug mode disabled
-    show_debug = False
-    
-    # Prepare occupation list
-    user_occupations = [okupasi_nama] if okupasi_nama else []
-    if okupasi_info:
-        area_fungsi = okupasi_info.get('area_fungsi', '')
-        if area_fungsi and area_fungsi not in user_occupations:
-            user_occupations.append(area_fungsi)
-    
+def _shift_rss_page(delta: int):
+    """Pagination callback: state diubah sebelum rerun, jadi tidak perlu st.rerun()"""
+    st.session_state.rss_jobs_page += delta
 
-    if not okupasi_nama:
-        st.error("❌ Tidak dapat mencari lowongan tanpa okupasi!")
-        return
-    
-    # Use KUK Keywords AND user CV skills for searching
-    search_skills = []
-    
-    # 1. Add CV Skills
-    if user_skills:
-        search_skills.extend(user_skills)
-        
-    # 2. Add KUK Keywords
-    if okupasi_info and 'kuk_keywords' in okupasi_info:
-        search_skills.extend(okupasi_info['kuk_keywords'])
-    
-    # Deduplicate
-    search_skills = list(dict.fromkeys(search_skills))
-    
-    # Fetch and process jobs (silent or verbose based on mode)
-    with st.spinner(f"🔍 Mencari lowongan dengan {len(search_skills)} keywords..."):
-        matched_jobs, debug_info = process_jobs_with_profile(
-            user_skills=search_skills, # Use Combined Skills
-            user_occupations=user_occupations,
-            unit_kompetensi=unit_kompetensi, 
-            max_results=50,
-            show_debug=show_debug,
-            silent_mode=silent_mode
-        )
-    
 
-    
-    # Check results
-    if not matched_jobs:
-        st.warning("⚠️ Tidak ada lowongan yang cocok ditemukan dari RSS feeds.")
-        
-        # Show helpful tips
-        with st.expander("💡 Tips untuk mendapatkan lebih banyak hasil"):
-            st.markdown("""
-            **Kemungkinan penyebab:**
-            1. Keywords terlalu spesifik
-            2. RSS feeds sedang tidak tersedia
-            3. Tidak ada lowongan baru yang match
-            
-            **Solusi:**
-            1. Tambahkan lebih banyak skills di profil Anda
-            2. Gunakan skills yang lebih umum (misal: "python" bukan "pytorch 2.0")
-            3. Coba lagi nanti (RSS feeds di-update secara berkala)
-            4. Gunakan tab "Job Portals" untuk alternatif pencarian
-            """)
-        
-        # Show what was searched (only if debug)
+def _refresh_rss_jobs():
+    """
+    Tombol Refresh: buang hasil di session ini & pakai nonce baru, jadi feed di-request
+    ulang (conditional GET) tanpa mengosongkan cache bersama milik session lain
+    """
+    st.session_state.pop('rss_matched_jobs', None)
+    st.session_state.rss_refresh_nonce = time.time_ns()
 
-        
-        return
-    
-    # Display results
-    st.success(f"✅ Ditemukan **{len(matched_jobs)}** lowongan yang cocok!")
-    
-    # Statistics
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Total Lowongan", len(matched_jobs))
-    
-    avg_score = sum(j['match_score'] for j in matched_jobs) / len(matched_jobs)
-    col2.metric("Rata-rata Match Score", f"{avg_score:.1f}")
-    
-    unique_sources = len(set(job['source'] for job in matched_jobs))
-    col3.metric("Sumber RSS", unique_sources)
-    
-    st.markdown("---")
-    
+
+# Style chip ada di blok <style> halaman (class .skill-chip), tidak diulang per span
+_SKILL_CHIP = "<span class='skill-chip'>{}</span>"
+
+
+@st.fragment
+def _render_rss_jobs_page(matched_jobs: List[Dict]):
+    """
+    Kartu lowongan + pagination (nested fragment): klik Next/Previous hanya
+    rerun bagian ini, bukan ekstraksi skill, matching, dan statistik di atasnya.
+    """
     # Pagination Setup
     if 'rss_jobs_page' not in st.session_state:
         st.session_state.rss_jobs_page = 1
@@ -486,6 +1018,13 @@ def render_rss_job_recommendations(
         color: #888;
         margin-bottom: 0.8rem;
     }
+    .skill-chip {
+        background-color: rgba(57, 255, 20, 0.1);
+        padding: 2px 6px;
+        border-radius: 4px;
+        font-size: 0.8em;
+        margin-right: 4px;
+    }
     </style>
     """, unsafe_allow_html=True)
 
@@ -514,7 +1053,7 @@ def render_rss_job_recommendations(
                 if job['matched_skills']:
                     st.write("") # Spacer
                     st.markdown("**🎯 Matched Skills:**")
-                    skills_html = " ".join([f"<span style='background-color: rgba(57, 255, 20, 0.1); padding: 2px 6px; border-radius: 4px; font-size: 0.8em; margin-right: 4px;'>{s}</span>" for s in job['matched_skills'][:10]])
+                    skills_html = " ".join(_SKILL_CHIP.format(s) for s in job['matched_skills'][:10])
                     st.markdown(skills_html, unsafe_allow_html=True)
             
             with col_body2:
@@ -539,18 +1078,123 @@ def render_rss_job_recommendations(
         
         with col_prev:
             if st.session_state.rss_jobs_page > 1:
-                if st.button("⬅️ Previous", key="prev_job_page", use_container_width=True):
-                    st.session_state.rss_jobs_page -= 1
-                    st.rerun()
+                st.button("⬅️ Previous", key="prev_job_page", use_container_width=True,
+                          on_click=_shift_rss_page, args=(-1,))
         
         with col_page:
             st.markdown(f"<p style='text-align: center; margin-top: 5px;'>Page <b>{st.session_state.rss_jobs_page}</b> of <b>{total_pages}</b></p>", unsafe_allow_html=True)
             
         with col_next:
             if st.session_state.rss_jobs_page < total_pages:
-                if st.button("Next ➡️", key="next_job_page", use_container_width=True):
-                    st.session_state.rss_jobs_page += 1
-                    st.rerun()
+                st.button("Next ➡️", key="next_job_page", use_container_width=True,
+                          on_click=_shift_rss_page, args=(1,))
+
+
+def render_rss_job_recommendations(
+    user_skills: List[str],
+    okupasi_nama: str,
+    unit_kompetensi: str = "",
+    okupasi_info: Dict = None,
+    silent_mode: bool = True
+):
+    """Render RSS job recommendations in Streamlit"""
+    
+    st.markdown("### 🌐 Remote Job Recommendations")
+    st.caption("Lowongan kerja remote dari berbagai platform internasional")
+    
+    # Debug mode disabled
+    show_debug = False
+    
+    # Prepare occupation list
+    user_occupations = [okupasi_nama] if okupasi_nama else []
+    if okupasi_info:
+        area_fungsi = okupasi_info.get('area_fungsi', '')
+        if area_fungsi and area_fungsi not in user_occupations:
+            user_occupations.append(area_fungsi)
+    
+
+    if not okupasi_nama:
+        st.error("❌ Tidak dapat mencari lowongan tanpa okupasi!")
+        return
+    
+    # Use KUK Keywords AND user CV skills for searching
+    search_skills = []
+    
+    # 1. Add CV Skills
+    if user_skills:
+        search_skills.extend(user_skills)
+        
+    # 2. Add KUK Keywords
+    if okupasi_info and 'kuk_keywords' in okupasi_info:
+        search_skills.extend(okupasi_info['kuk_keywords'])
+    
+    # Deduplicate
+    search_skills = list(dict.fromkeys(search_skills))
+    
+    # Hasil matching dipakai ulang antar rerun (pagination dll) selama profil sama
+    rss_key = (tuple(search_skills), tuple(user_occupations), unit_kompetensi)
+    if st.session_state.get('rss_key') != rss_key or 'rss_matched_jobs' not in st.session_state:
+        # Fetch and process jobs (silent or verbose based on mode)
+        with st.spinner(f"🔍 Mencari lowongan dengan {len(search_skills)} keywords..."):
+            matched_jobs, debug_info = process_jobs_with_profile(
+                user_skills=search_skills, # Use Combined Skills
+                user_occupations=user_occupations,
+                unit_kompetensi=unit_kompetensi, 
+                max_results=50,
+                show_debug=show_debug,
+                silent_mode=silent_mode,
+                refresh_nonce=st.session_state.get('rss_refresh_nonce', 0)
+            )
+        if st.session_state.get('rss_key') != rss_key:
+            st.session_state.rss_jobs_page = 1
+        st.session_state.rss_key = rss_key
+        st.session_state.rss_matched_jobs = matched_jobs
+    matched_jobs = st.session_state.rss_matched_jobs
+    
+    st.button("🔄 Refresh", key="refresh_rss_jobs", on_click=_refresh_rss_jobs)
+    
+
+    
+    # Check results
+    if not matched_jobs:
+        st.warning("⚠️ Tidak ada lowongan yang cocok ditemukan dari RSS feeds.")
+        
+        # Show helpful tips
+        with st.expander("💡 Tips untuk mendapatkan lebih banyak hasil"):
+            st.markdown("""
+            **Kemungkinan penyebab:**
+            1. Keywords terlalu spesifik
+            2. RSS feeds sedang tidak tersedia
+            3. Tidak ada lowongan baru yang match
+            
+            **Solusi:**
+            1. Tambahkan lebih banyak skills di profil Anda
+            2. Gunakan skills yang lebih umum (misal: "python" bukan "pytorch 2.0")
+            3. Coba lagi nanti (RSS feeds di-update secara berkala)
+            4. Gunakan tab "Job Portals" untuk alternatif pencarian
+            """)
+        
+        # Show what was searched (only if debug)
+
+        
+        return
+    
+    # Display results
+    st.success(f"✅ Ditemukan **{len(matched_jobs)}** lowongan yang cocok!")
+    
+    # Statistics
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Lowongan", len(matched_jobs))
+    
+    avg_score = sum(j['match_score'] for j in matched_jobs) / len(matched_jobs)
+    col2.metric("Rata-rata Match Score", f"{avg_score:.1f}")
+    
+    unique_sources = len(set(job['source'] for job in matched_jobs))
+    col3.metric("Sumber RSS", unique_sources)
+    
+    st.markdown("---")
+    
+    _render_rss_jobs_page(matched_jobs)
     
     # Tips
     st.markdown("---")
@@ -8,10 +8,16 @@ from .skkni_matcher import (
     display_learning_path,
     display_skill_gap_chart
 )
+from .http_session import get_http_session
+from .embeddings import load_embedding_model, load_query_encoder, encode_query
 
 __all__ = [
     'create_skkni_matcher',
     'SKKNIMatcher',
     'display_learning_path',
-    'display_skill_gap_chart'
+    'display_skill_gap_chart',
+    'get_http_session',
+    'load_embedding_model',
+    'load_query_encoder',
+    'encode_query'
 ]
\ No newline at end of file
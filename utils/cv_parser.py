@@ -5,7 +5,9 @@ CV Parsing & Text Extraction Utilities
 
 import re
 import io
+import functools
 import docx
+import streamlit as st
 from PyPDF2 import PdfReader
 
 def extract_text_from_pdf(file_io):
@@ -30,6 +32,7 @@ def extract_text_from_docx(file_io):
     except Exception as e:
         raise Exception(f"Error extracting DOCX: {e}")
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def parse_cv_data(cv_text):
     """
     Parse CV text untuk ekstrak informasi penting
@@ -79,13 +82,15 @@ def parse_cv_data(cv_text):
     
     return data
 
-def extract_skill_tokens(text: str) -> list:
+@functools.lru_cache(maxsize=1024)
+def extract_skill_tokens(text: str) -> tuple:
     """
     Ekstrak skill tokens dari text
     Split by comma, slash, pipe, semicolon
+    Di-memoize (teks CV / skill gap yang sama dipakai berulang), jadi hasilnya tuple immutable
     """
     if not isinstance(text, str):
-        return []
+        return ()
     
     text = text.lower().strip()
     
@@ -101,7 +106,7 @@ def extract_skill_tokens(text: str) -> list:
             tokens.append(part)
             seen.add(part)
     
-    return tokens
+    return tuple(tokens)
 
 def normalize_text(text: str) -> str:
     """Normalize text untuk matching"""
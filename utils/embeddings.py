@@ -0,0 +1,62 @@
+"""
+Shared Embedding Model
+Satu instance Sentence Transformer per proses, dipakai bersama oleh
+semantic search (mapping okupasi) dan semantic cache chatbot.
+"""
+
+import logging
+import functools
+
+import numpy as np
+import streamlit as st
+
+from config import SEMANTIC_MODEL, ENABLE_ONNX_QUERY_ENCODER, ONNX_QUERY_MODEL_FILE
+
+logger = logging.getLogger("dtpmxy")
+
+QUERY_EMBEDDING_CACHE_SIZE = 256
+
+
+@st.cache_resource(show_spinner="Memuat model semantic search...")
+def load_embedding_model(model_name: str = SEMANTIC_MODEL):
+    """
+    Load Sentence Transformer sekali per proses (shared antar session & rebuild index).
+    Import torch/sentence_transformers ditunda sampai model benar-benar diminta,
+    jadi import paket utils (mis. hanya skkni_matcher) tetap ringan.
+    """
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+@st.cache_resource(show_spinner=False)
+def load_query_encoder(model_name: str = SEMANTIC_MODEL):
+    """
+    Encoder untuk query tunggal (hot path: mapping profil, semantic cache chatbot,
+    ranking RSS). Dengan ENABLE_ONNX_QUERY_ENCODER dipakai backend ONNX Runtime
+    berbobot INT8; jika onnxruntime/file ONNX tidak tersedia, fallback ke model
+    PyTorch bersama dari load_embedding_model().
+    """
+    if ENABLE_ONNX_QUERY_ENCODER:
+        try:
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(
+                model_name,
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_QUERY_MODEL_FILE, "provider": "CPUExecutionProvider"}
+            )
+        except Exception:
+            logger.warning("ONNX query encoder tidak tersedia, pakai model PyTorch", exc_info=True)
+    return load_embedding_model(model_name)
+
+
+@functools.lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+def encode_query(text: str, model_name: str = SEMANTIC_MODEL) -> np.ndarray:
+    """
+    Embedding query (1, d) float32 ter-normalisasi, di-memoize per teks: profil yang
+    sama (rerun, pindah tab) tidak di-encode ulang. Hanya di memori proses; teks CV
+    adalah data pribadi, jadi sengaja tidak dipersist ke disk.
+    Array dipakai bersama antar pemanggil, jangan dimodifikasi in-place.
+    """
+    return load_query_encoder(model_name).encode(
+        [text], convert_to_numpy=True, normalize_embeddings=True
+    ).astype(np.float32, copy=False)
@@ -0,0 +1,38 @@
+"""
+Shared HTTP Session
+Satu requests.Session (connection pool + keep-alive + retry) untuk semua
+panggilan keluar: RSS feeds, Gemini API, dll.
+"""
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Session bersama untuk seluruh proses (cache_resource).
+    Koneksi TCP/TLS ke host yang sama dipakai ulang antar request dan antar rerun.
+
+    Retry hanya untuk method idempotent (default urllib3), jadi POST ke
+    Gemini tidak dikirim ulang secara diam-diam.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -4,6 +4,11 @@
 """
 Semantic Search Engine menggunakan FAISS + Sentence Transformers
 Mendukung PON TIK dan SKKNI mapping
+
+Catatan: file ini (beserta bagian course_recommender / job_search / rl_engine
+di bawah) belum dipakai app dan belum bisa di-import: EMBEDDING_MODEL,
+SHEET_SKKNI, SHEET_MAXY dan GOOGLE_CSE_API_KEY tidak ada di config.py.
+Pipeline PON yang jalan ada di app.py (initialize_semantic_search).
 """
 
 import os
@@ -18,6 +23,16 @@ from config import (
     EMBEDDING_MODEL, FAISS_INDEX_FILE, FAISS_DATA_FILE,
     SKKNI_INDEX_FILE, SKKNI_DATA_FILE
 )
+from utils.embeddings import encode_query
+
+
+def _read_index(path: str):
+    """Load index via mmap (read-only, halaman dimuat on demand), fallback ke read biasa"""
+    try:
+        return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except Exception:
+        return faiss.read_index(path)
+
 
 @st.cache_resource
 def initialize_pon_semantic_search():
@@ -34,7 +49,7 @@ def initialize_pon_semantic_search():
     # Cek apakah index sudah ada
     if os.path.exists(INDEX_FILE) and os.path.exists(DATA_FILE):
         try:
-            index = faiss.read_index(INDEX_FILE)
+            index = _read_index(INDEX_FILE)
             with open(DATA_FILE, 'rb') as f:
                 df_pon = pickle.load(f)
             st.success("✅ PON TIK semantic engine loaded from cache")
@@ -51,15 +66,16 @@ def initialize_pon_semantic_search():
         st.error("Data PON TIK kosong!")
         return None, None, None
     
-    # Buat corpus dari kolom relevan
-    pon_corpus = (
-        "Okupasi: " + df_pon['Okupasi'].astype(str) + ". " +
-        "Unit Kompetensi: " + df_pon['Unit_Kompetensi'].astype(str) + ". " +
-        "Keterampilan: " + df_pon['Kuk_Keywords'].astype(str)
-    )
+    # Buat corpus dari kolom relevan (satu f-string per baris, tanpa Series perantara)
+    pon_corpus = [
+        f"Okupasi: {o}. Unit Kompetensi: {u}. Keterampilan: {k}"
+        for o, u, k in df_pon[['Okupasi', 'Unit_Kompetensi', 'Kuk_Keywords']].astype(str).itertuples(
+            index=False, name=None
+        )
+    ]
     
     # Encode
-    pon_vectors = model.encode(pon_corpus.tolist(), show_progress_bar=True)
+    pon_vectors = model.encode(pon_corpus, show_progress_bar=True)
     
     # Build FAISS index
     d = pon_vectors.shape[1]
@@ -91,7 +107,7 @@ def initialize_skkni_semantic_search():
     # Cek cache
     if os.path.exists(INDEX_FILE) and os.path.exists(DATA_FILE):
         try:
-            index = faiss.read_index(INDEX_FILE)
+            index = _read_index(INDEX_FILE)
             with open(DATA_FILE, 'rb') as f:
                 df_skkni = pickle.load(f)
             st.success("✅ SKKNI semantic engine loaded from cache")
@@ -108,16 +124,16 @@ def initialize_skkni_semantic_search():
         st.error("Data SKKNI kosong!")
         return None, None, None
     
-    # Buat corpus
-    skkni_corpus = (
-        "SKKNI: " + df_skkni['Nama_SKKNI'].astype(str) + ". " +
-        "Bidang: " + df_skkni['Bidang'].astype(str) + ". " +
-        "Kompetensi: " + df_skkni['Unit_Kompetensi'].astype(str) + ". " +
-        "Keywords: " + df_skkni['Keywords'].astype(str)
-    )
+    # Buat corpus (satu f-string per baris, tanpa Series perantara)
+    skkni_corpus = [
+        f"SKKNI: {n}. Bidang: {b}. Kompetensi: {u}. Keywords: {k}"
+        for n, b, u, k in df_skkni[['Nama_SKKNI', 'Bidang', 'Unit_Kompetensi', 'Keywords']].astype(str).itertuples(
+            index=False, name=None
+        )
+    ]
     
     # Encode
-    skkni_vectors = model.encode(skkni_corpus.tolist(), show_progress_bar=True)
+    skkni_vectors = model.encode(skkni_corpus, show_progress_bar=True)
     
     # Build index
     d = skkni_vectors.shape[1]
@@ -142,8 +158,7 @@ def map_profile_to_pon(profile_text: str):
         return None
     
     try:
-        query_vector = model.encode([profile_text])
-        faiss.normalize_L2(query_vector)
+        query_vector = encode_query(profile_text, EMBEDDING_MODEL)
         
         scores, indices = index.search(query_vector, k=3)
         
@@ -181,8 +196,7 @@ def map_profile_to_skkni(profile_text: str, pon_okupasi_id: str = None):
                 return related_skkni.iloc[0].to_dict()
         
         # Semantic search
-        query_vector = model.encode([profile_text])
-        faiss.normalize_L2(query_vector)
+        query_vector = encode_query(profile_text, EMBEDDING_MODEL)
         
         scores, indices = index.search(query_vector, k=3)
         
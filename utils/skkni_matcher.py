@@ -3,11 +3,117 @@ SKKNI Smart Matcher - Simplified Version
 Menghubungkan CV → SKKNI/PON TIK → Rekomendasi Course (dari Excel)
 """
 
+import functools
+import logging
+import os
+from collections import defaultdict
+import numpy as np
 import pandas as pd
 import streamlit as st
 from typing import Dict, List
 import re
 
+logger = logging.getLogger("dtpmxy")
+
+# Reader xlsx: calamine (Rust, pandas>=2.2) jauh lebih cepat dari openpyxl.
+# Fallback openpyxl: pandas sudah membukanya read_only/data_only, tanpa DOM penuh.
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+# Plotly opsional: tanpa plotly, skill gap ditampilkan sebagai st.metric
+try:
+    import plotly.graph_objects as go
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+# Kolom course yang dipakai app (display & filter) + get_recommended_courses.
+# Dipakai sebagai usecols callable, jadi kolom yang tidak ada di sheet tidak error.
+COURSE_COLUMNS = frozenset({
+    'CourseID', 'Title', 'Platform', 'Jenis', 'URL',
+    'Skills', 'Judul', 'Instructor', 'Price', 'Level', 'Deskripsi'
+})
+
+# Kolom PON yang dibaca SKKNIMatcher (get_okupasi_details / _infer_level);
+# kolom teks di-baca langsung sebagai str, tanpa inferensi tipe per sel
+PON_COLUMNS = frozenset({'OkupasiID', 'Okupasi', 'Area_Fungsi', 'Unit_Kompetensi', 'Kuk_Keywords'})
+PON_TEXT_DTYPES = {col: str for col in ('Okupasi', 'Area_Fungsi', 'Unit_Kompetensi', 'Kuk_Keywords')}
+
+_KUK_SPLIT_RE = re.compile(r'[,;|\n]+')
+
+# Variasi job title (key dicari sebagai substring di nama okupasi lowercase)
+_TITLE_MAPPINGS = {
+    'data scientist': ['data science', 'ds', 'data analyst'],
+    'software engineer': ['software developer', 'programmer', 'swe'],
+    'devops engineer': ['devops', 'site reliability engineer', 'sre'],
+    'ui/ux designer': ['ui designer', 'ux designer', 'product designer'],
+}
+# Satu alternation untuk semua key: satu scan per title, berapapun jumlah mapping
+_TITLE_RE = re.compile('|'.join(
+    re.escape(key) for key in sorted(_TITLE_MAPPINGS, key=len, reverse=True)
+))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_keywords_cached(kuk_raw: str) -> tuple:
+    """Parse keywords dari string, respecting parentheses (di-memoize per string mentah)"""
+    # Fast path: tanpa '(' tidak ada separator yang perlu dilindungi -> cukup re.split (C)
+    if '(' not in kuk_raw:
+        parts = (p.strip().lower() for p in _KUK_SPLIT_RE.split(kuk_raw))
+        return tuple(dict.fromkeys(p for p in parts if p))
+    
+    # Ada kurung (bisa nested / tidak tertutup): parse char by char
+    keywords = []
+    current_word = []
+    paren_depth = 0
+    
+    # Parse char by char to handle parentheses
+    for char in kuk_raw:
+        if char == '(':
+            paren_depth += 1
+            current_word.append(char)
+        elif char == ')':
+            if paren_depth > 0:
+                paren_depth -= 1
+            current_word.append(char)
+        elif char in [',', ';', '|', '\n'] and paren_depth == 0:
+            word = "".join(current_word).strip()
+            if word:
+                keywords.append(word.lower())
+            current_word = []
+        else:
+            # Replace newline with space if passing through
+            if char == '\n':
+                current_word.append(' ')
+            else:
+                current_word.append(char)
+            
+    # Handle last word
+    if current_word:
+        word = "".join(current_word).strip()
+        if word:
+            keywords.append(word.lower())
+    
+    return tuple(dict.fromkeys(keywords))
+
+
+# (container, icon) per fase learning path: 1 Foundation, 2 Intermediate, >=3 Advanced
+_PHASE_STYLES = (
+    (st.info, "🎯"),     # Blue for Foundation
+    (st.success, "📈"),  # Green for Intermediate
+    (st.warning, "🚀"),  # Orange for Advanced
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _skills_markdown(skills: tuple) -> str:
+    """Markdown skill list untuk satu fase learning path (skill yang sama berulang antar okupasi)"""
+    return ", ".join(f"**{s.title()}**" for s in skills)
+
+
 class SKKNIMatcher:
     """
     Class untuk matching CV dengan SKKNI/PON TIK
@@ -21,8 +127,38 @@ class SKKNIMatcher:
             df_courses: DataFrame Course dari Excel (opsional)
         """
         self.df_pon = df_pon
+        
+        # Lowercase judul course sekali saat load (dipakai filter keyword setiap rerun)
+        if df_courses is not None and 'Title' in df_courses:
+            df_courses = df_courses.assign(_title_lower=df_courses['Title'].astype(str).str.lower())
         self.df_courses = df_courses
     
+    @functools.cached_property
+    def _course_skill_sets(self) -> List[frozenset]:
+        """
+        Skill set per course, di-parse sekali saat pertama dibutuhkan
+        get_recommended_courses (bukan saat matcher di-load)
+        """
+        df_courses = self.df_courses
+        if df_courses is not None and 'Skills' in df_courses:
+            return [frozenset(self._parse_keywords(str(s))) for s in df_courses['Skills'].fillna('')]
+        return [frozenset()] * (0 if df_courses is None else len(df_courses))
+    
+    @functools.cached_property
+    def _skill_postings(self) -> Dict[str, np.ndarray]:
+        """
+        Inverted index skill -> posisi course (int32); skor query = bincount posting list.
+        Dibangun bersama _course_skill_sets pada panggilan get_recommended_courses pertama
+        """
+        postings = defaultdict(list)
+        for pos, course_skills in enumerate(self._course_skill_sets):
+            for skill in course_skills:
+                postings[skill].append(pos)
+        return {
+            skill: np.fromiter(positions, dtype=np.int32, count=len(positions))
+            for skill, positions in postings.items()
+        }
+    
     def get_okupasi_details(self, okupasi_id: str) -> Dict:
         """
         Ambil detail lengkap okupasi berdasarkan ID
@@ -98,6 +234,7 @@ class SKKNIMatcher:
                 'phase': 1,
                 'title': '🎯 Foundation Phase (Priority)',
                 'skills': phase_1,
+                'skills_markdown': _skills_markdown(tuple(phase_1)),
                 'estimated_duration': '1-2 bulan',
                 'focus': 'Core skills yang paling dibutuhkan pasar'
             })
@@ -107,6 +244,7 @@ class SKKNIMatcher:
                 'phase': 2,
                 'title': '📈 Intermediate Phase',
                 'skills': phase_2,
+                'skills_markdown': _skills_markdown(tuple(phase_2)),
                 'estimated_duration': '2-3 bulan',
                 'focus': 'Spesialisasi dan tools lanjutan'
             })
@@ -116,6 +254,7 @@ class SKKNIMatcher:
                 'phase': 3,
                 'title': '🚀 Advanced Phase',
                 'skills': phase_3,
+                'skills_markdown': _skills_markdown(tuple(phase_3)),
                 'estimated_duration': '3-6 bulan',
                 'focus': 'Expert-level skills dan certification'
             })
@@ -132,36 +271,37 @@ class SKKNIMatcher:
         if self.df_courses is None or self.df_courses.empty:
             return []
         
-        skills_lower = set(s.lower() for s in skills)
+        skills_lower = frozenset(s.lower() for s in skills)
+        
+        # Jumlah skill cocok per course = bincount gabungan posting list skill user
+        postings = [self._skill_postings[s] for s in skills_lower if s in self._skill_postings]
+        if not postings:
+            return []
+        scores = np.bincount(np.concatenate(postings), minlength=len(self._course_skill_sets))
+        
+        # Top-N: skor desc, tie-break posisi asc (urutan sama dengan sort stabil sebelumnya);
+        # dict hanya dibangun untuk top-N
+        candidates = np.flatnonzero(scores)
+        top = candidates[np.lexsort((candidates, -scores[candidates]))][:top_n]
         
         courses_with_score = []
+        for pos in top:
+            matched = skills_lower & self._course_skill_sets[pos]
+            row = self.df_courses.iloc[pos]
+            courses_with_score.append({
+                'course_id': str(row.get('CourseID', 'N/A')),
+                'title': str(row.get('Judul', 'N/A')),
+                'instructor': str(row.get('Instructor', 'N/A')),
+                'price': str(row.get('Price', 'Gratis')),
+                'level': str(row.get('Level', 'All Levels')),
+                'url': str(row.get('URL', '#')),
+                'description': str(row.get('Deskripsi', '')),
+                'platform': str(row.get('Platform', 'Maxy Academy')),
+                'matched_skills': list(matched),
+                'match_score': len(matched)
+            })
         
-        for _, row in self.df_courses.iterrows():
-            course_skills_raw = str(row.get('Skills', ''))
-            course_skills = set(self._parse_keywords(course_skills_raw))
-            
-            # Calculate match score
-            matched = skills_lower & course_skills
-            match_score = len(matched)
-            
-            if match_score > 0:
-                courses_with_score.append({
-                    'course_id': str(row.get('CourseID', 'N/A')),
-                    'title': str(row.get('Judul', 'N/A')),
-                    'instructor': str(row.get('Instructor', 'N/A')),
-                    'price': str(row.get('Price', 'Gratis')),
-                    'level': str(row.get('Level', 'All Levels')),
-                    'url': str(row.get('URL', '#')),
-                    'description': str(row.get('Deskripsi', '')),
-                    'platform': str(row.get('Platform', 'Maxy Academy')),
-                    'matched_skills': list(matched),
-                    'match_score': match_score
-                })
-        
-        # Sort by match score
-        courses_with_score.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        return courses_with_score[:top_n]
+        return courses_with_score
     
     def get_job_search_keywords(self, okupasi_id: str) -> List[str]:
         """
@@ -197,39 +337,7 @@ class SKKNIMatcher:
         """Parse keywords dari string, respecting parentheses"""
         if not isinstance(kuk_raw, str):
             return []
-        
-        keywords = []
-        current_word = []
-        paren_depth = 0
-        
-        # Parse char by char to handle parentheses
-        for char in kuk_raw:
-            if char == '(':
-                paren_depth += 1
-                current_word.append(char)
-            elif char == ')':
-                if paren_depth > 0:
-                    paren_depth -= 1
-                current_word.append(char)
-            elif char in [',', ';', '|', '\n'] and paren_depth == 0:
-                word = "".join(current_word).strip()
-                if word:
-                    keywords.append(word.lower())
-                current_word = []
-            else:
-                # Replace newline with space if passing through
-                if char == '\n':
-                    current_word.append(' ')
-                else:
-                    current_word.append(char)
-                
-        # Handle last word
-        if current_word:
-            word = "".join(current_word).strip()
-            if word:
-                keywords.append(word.lower())
-        
-        return list(dict.fromkeys(keywords))
+        return list(_parse_keywords_cached(kuk_raw))
     
     def _infer_level(self, row: pd.Series) -> str:
         """Infer level dari okupasi"""
@@ -260,19 +368,14 @@ class SKKNIMatcher:
     
     def _generate_job_title_variations(self, title: str) -> List[str]:
         """Generate variasi job title"""
-        variations = []
-        
-        mappings = {
-            'data scientist': ['data science', 'ds', 'data analyst'],
-            'software engineer': ['software developer', 'programmer', 'swe'],
-            'devops engineer': ['devops', 'site reliability engineer', 'sre'],
-            'ui/ux designer': ['ui designer', 'ux designer', 'product designer'],
-        }
-        
-        title_lower = title.lower()
+        found = set(_TITLE_RE.findall(title.lower()))
+        if not found:
+            return []
         
-        for key, vars in mappings.items():
-            if key in title_lower:
+        # Urutan output tetap mengikuti urutan _TITLE_MAPPINGS
+        variations = []
+        for key, vars in _TITLE_MAPPINGS.items():
+            if key in found:
                 variations.extend(vars)
         
         return variations
@@ -285,21 +388,41 @@ class SKKNIMatcher:
 def create_skkni_matcher(excel_path: str, sheet_pon: str, sheet_course: str = None) -> SKKNIMatcher:
     """
     Factory function untuk create matcher instance
+    (di-cache per proses; mtime file ikut jadi key sehingga edit Excel me-refresh cache)
     """
     try:
-        df_pon = pd.read_excel(excel_path, sheet_name=sheet_pon, engine='openpyxl')
+        return _load_skkni_matcher(excel_path, sheet_pon, sheet_course, os.path.getmtime(excel_path))
+    except Exception as e:
+        # Traceback lengkap ke log; UI cukup pesan singkat
+        logger.exception("Gagal load data SKKNI dari %s", excel_path)
+        st.error(f"❌ Gagal load data SKKNI: {e}")
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def _load_skkni_matcher(excel_path: str, sheet_pon: str, sheet_course: str, mtime: float) -> SKKNIMatcher:
+    """Parse Excel + build SKKNIMatcher; exception tidak di-cache (ditangani caller)"""
+    # Satu ExcelFile: zip + shared strings di-parse sekali untuk kedua sheet
+    with pd.ExcelFile(excel_path, engine=EXCEL_ENGINE) as xl:
+        df_pon = xl.parse(
+            sheet_pon,
+            usecols=lambda col: col in PON_COLUMNS,
+            dtype=PON_TEXT_DTYPES
+        )
         
         df_courses = None
         if sheet_course:
-            try:
-                df_courses = pd.read_excel(excel_path, sheet_name=sheet_course, engine='openpyxl')
-            except:
+            if sheet_course in xl.sheet_names:
+                # Arrow-backed dtypes: st.dataframe bisa kirim tabel tanpa konversi object->arrow
+                df_courses = xl.parse(
+                    sheet_course,
+                    usecols=lambda col: col in COURSE_COLUMNS,
+                    dtype_backend='pyarrow'
+                )
+            else:
                 st.warning(f"⚠️ Sheet '{sheet_course}' tidak ditemukan. Course recommendation dinonaktifkan.")
-        
-        return SKKNIMatcher(df_pon, df_courses)
-    except Exception as e:
-        st.error(f"❌ Gagal load data SKKNI: {e}")
-        return None
+    
+    return SKKNIMatcher(df_pon, df_courses)
 
 
 def display_learning_path(learning_path: List[Dict]):
@@ -311,62 +434,64 @@ def display_learning_path(learning_path: List[Dict]):
     # st.markdown("### 📚 Learning Path Rekomendasi") # Header removed
     
     for phase in learning_path:
-        p_num = phase['phase']
-        
-        # Determine container style/color based on phase
-        if p_num == 1:
-            container_func = st.info  # Blue for Foundation
-            icon = "🎯"
-        elif p_num == 2:
-            container_func = st.success  # Green for Intermediate
-            icon = "📈"
-        else:
-            container_func = st.warning  # Orange for Advanced
-            icon = "🚀"
+        # Determine container style/color based on phase (fase di luar 1/2 -> Advanced)
+        container_func, icon = _PHASE_STYLES[min(phase['phase'], 3) - 1]
             
         with st.container():
-            st.markdown(f"#### {icon} {phase['title']}")
-            
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                 st.markdown(f"**Fokus:** {phase['focus']}")
-            with col2:
-                 st.caption(f"⏱️ **Estimasi:** {phase['estimated_duration']}")
+            # Header + fokus + estimasi dalam satu markdown (tanpa st.columns per fase)
+            st.markdown(
+                f"#### {icon} {phase['title']}\n\n"
+                f"**Fokus:** {phase['focus']} &nbsp;·&nbsp; ⏱️ **Estimasi:** {phase['estimated_duration']}"
+            )
             
             # Use the color box for skills
             with container_func("Skills to Learn"):
-                skills_text = ", ".join([f"**{s.title()}**" for s in phase['skills']])
-                st.markdown(skills_text)
+                st.markdown(phase['skills_markdown'])
             
             st.write("") # Spacer
 
 
+@functools.lru_cache(maxsize=1)
+def _gap_figure_template():
+    """Bagian konstan pie chart skill gap (labels, warna, layout), divalidasi plotly sekali"""
+    fig = go.Figure(data=[
+        go.Pie(
+            labels=['Skills Dimiliki', 'Skills Gap'],
+            values=[0, 0],
+            hole=.4,
+            marker_colors=['#4CAF50', '#FF5252']
+        )
+    ])
+    fig.update_layout(height=300)
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _skill_gap_figure(owned: int, missing: int, gap_percentage: float):
+    """
+    Pie chart skill gap; di-cache per (owned, missing, gap%) agar validasi plotly tidak diulang tiap rerun.
+    cache_resource (bukan cache_data): figure tidak di-pickle/unpickle, yang akan memvalidasi ulang
+    seluruh properti. Objek dipakai bersama antar sesi, jadi pemanggil tidak boleh memodifikasinya.
+    """
+    # Clone template, hanya values & title yang diisi per data
+    fig = go.Figure(_gap_figure_template())
+    fig.data[0].values = (owned, missing)
+    fig.layout.title.text = f"Skill Gap: {gap_percentage}%"
+    return fig
+
+
 def display_skill_gap_chart(gap_analysis: Dict):
     """Display skill gap visualization"""
     if not gap_analysis:
         return
     
-    try:
-        import plotly.graph_objects as go
-        
-        owned = len(gap_analysis['owned_skills'])
-        missing = len(gap_analysis['missing_skills'])
-        
-        fig = go.Figure(data=[
-            go.Pie(
-                labels=['Skills Dimiliki', 'Skills Gap'],
-                values=[owned, missing],
-                hole=.4,
-                marker_colors=['#4CAF50', '#FF5252']
-            )
-        ])
-        
-        fig.update_layout(
-            title=f"Skill Gap: {gap_analysis['gap_percentage']}%",
-            height=300
+    if PLOTLY_AVAILABLE:
+        fig = _skill_gap_figure(
+            len(gap_analysis['owned_skills']),
+            len(gap_analysis['missing_skills']),
+            gap_analysis['gap_percentage']
         )
-        
         st.plotly_chart(fig, use_container_width=True)
-    except ImportError:
+    else:
         # Fallback jika plotly tidak tersedia
         st.metric("Skill Gap", f"{gap_analysis['gap_percentage']}%")
\ No newline at end of file